@@ -0,0 +1,369 @@
+"""
+Benchmark reprodutível do mecanismo de busca do MKACETE (mkacete.MecanismoBuscaAvancado).
+
+Gera planilhas sintéticas com as mesmas colunas da BATMAN.xlsx (PRESTADOR, PROCEDIMENTOS, TUSS,
+AMB, CNPJ, RAZAO SOCIAL, ZONA/REGIÃO, CD PESSOA) em vários tamanhos, repete uma mistura realista
+de consultas (códigos, nomes, erros de digitação e filtros) e mede o tempo de carregamento, a
+latência de cada etapa da busca, a vazão e o pico de memória (RSS). Cada tamanho roda em um
+processo separado, para que o pico de memória de um não contamine o outro. Os resultados são
+gravados em JSON, e duas execuções podem ser comparadas com --comparar.
+
+Uso:
+    python benchmark.py                                  # 1k, 10k, 100k e 1M linhas
+    python benchmark.py --tamanhos 1000,10000 --consultas 20
+    python benchmark.py --comparar antes.json depois.json
+"""
+
+import argparse  # Leitura das opções da linha de comando.
+import contextlib  # Silencia as mensagens do mecanismo de busca durante as medições.
+import io  # Destino em memória das mensagens silenciadas.
+import json  # Formato dos resultados (legível por máquina) e da comunicação com os processos filhos.
+import os  # Caminhos das planilhas geradas e dos resultados.
+import platform  # Identificação da máquina nos resultados.
+import subprocess  # Execução de cada tamanho em um processo separado (pico de memória isolado).
+import sys  # Caminho do interpretador Python e da plataforma.
+import time  # Temporizadores monotônicos (time.perf_counter) das medições.
+import numpy as np  # Geração vetorizada dos dados sintéticos e cálculo dos percentis.
+from openpyxl import Workbook  # Gravação das planilhas sintéticas (modo somente escrita, em fluxo).
+
+try:
+    import resource  # Pico de memória do processo (RSS máximo) em sistemas POSIX.
+except ImportError:
+    resource = None
+
+# Versão do formato do arquivo de resultados: incrementar ao mudar a estrutura gravada.
+VERSAO_RESULTADOS = 1
+TAMANHOS_PADRAO = [1000, 10000, 100000, 1000000]
+NOME_ABA = 'PROCEDIMENTOS'
+COLUNAS = ['PRESTADOR', 'PROCEDIMENTOS', 'TUSS', 'AMB', 'CNPJ', 'RAZAO SOCIAL', 'ZONA/REGIÃO', 'CD PESSOA']
+# Etapas do mecanismo (MetricasDesempenho) incluídas nos resultados.
+ETAPAS_MEDIDAS = ['preparo', 'filtros', 'codigo', 'exata', 'relevancia', 'fuzzy', 'montagem', 'busca']
+# Configuração do mecanismo durante o benchmark: tudo carregado na inicialização e sem cache,
+# para medir o custo real de cada consulta.
+CONFIG_BENCHMARK = {
+    'carregamento_sob_demanda': False,
+    'aquecimento_em_segundo_plano': False,
+    'intervalo_recarga_segundos': 0,
+    'habilitar_cache': False,
+    'habilitar_snapshot': True,
+    'arquivo_metricas': '',
+}
+
+# Vocabulário dos dados sintéticos, no formato da BATMAN.xlsx (maiúsculas, com acentos).
+TIPOS_PRESTADOR = ['HOSPITAL', 'CLÍNICA', 'CENTRO MÉDICO', 'LABORATÓRIO', 'INSTITUTO', 'POLICLÍNICA',
+                   'CENTRO DE DIAGNÓSTICO']
+NOMES_PRESTADOR = ['SÃO LUCAS', 'SANTA CASA', 'BOA VISTA', 'VIDA', 'ESPERANÇA', 'SÃO JOSÉ', 'SANTA MARIA',
+                   'PAULISTA', 'DO CORAÇÃO', 'BANDEIRANTES', 'SÃO CAMILO', 'ALVORADA', 'SANTA ISABEL',
+                   'NOVE DE JULHO', 'IGUATEMI', 'PINHEIROS', 'TATUAPÉ', 'MOOCA', 'LAPA', 'IPIRANGA']
+PROCEDIMENTOS_BASE = ['CONSULTA EM CARDIOLOGIA', 'ELETROCARDIOGRAMA', 'ECOCARDIOGRAMA TRANSTORÁCICO',
+                      'RESSONÂNCIA MAGNÉTICA', 'TOMOGRAFIA COMPUTADORIZADA', 'ULTRASSONOGRAFIA',
+                      'HEMOGRAMA COMPLETO', 'INFILTRAÇÃO ARTICULAR', 'BLOQUEIO ANESTÉSICO DE NERVO',
+                      'CONSULTA EM ORTOPEDIA', 'COLONOSCOPIA', 'ENDOSCOPIA DIGESTIVA ALTA', 'MAMOGRAFIA',
+                      'DENSITOMETRIA ÓSSEA', 'SESSÃO DE FISIOTERAPIA', 'TESTE ERGOMÉTRICO', 'HOLTER 24 HORAS',
+                      'CONSULTA EM PEDIATRIA', 'RADIOGRAFIA', 'CINTILOGRAFIA MIOCÁRDICA']
+REGIOES_CORPO = ['', ' DE JOELHO', ' DE OMBRO', ' DE COLUNA LOMBAR', ' DE QUADRIL', ' DE CRÂNIO']
+MODIFICADORES = ['', ' COM CONTRASTE', ' BILATERAL', ' SEM SEDAÇÃO']
+ZONAS = ['ZONA NORTE', 'ZONA SUL', 'ZONA LESTE', 'ZONA OESTE', 'CENTRO', 'ABC', 'GRANDE SÃO PAULO']
+# Palavras procuradas nas consultas por nome (sem acento, como digitadas pelos operadores).
+PALAVRAS_BUSCA = ['cardiologia', 'ressonancia magnetica', 'tomografia', 'hemograma', 'infiltracao',
+                  'fisioterapia', 'ortopedia', 'endoscopia', 'mamografia', 'joelho', 'contraste', 'pediatria',
+                  'santa casa', 'sao lucas', 'hospital', 'clinica', 'tomogr', 'ecocardio']
+
+
+# =================================================================================
+# GERAÇÃO DOS DADOS SINTÉTICOS
+# =================================================================================
+
+def _catalogos(rng, linhas):
+    """Monta os catálogos de prestadores e procedimentos (com seus códigos) para o tamanho pedido."""
+    procedimentos = [base + regiao + modificador
+                     for base in PROCEDIMENTOS_BASE for regiao in REGIOES_CORPO for modificador in MODIFICADORES]
+    # Códigos TUSS de 8 dígitos, únicos por procedimento; AMB no formato 'NN.NN.NNN-N'.
+    tuss = 10000000 + rng.choice(40000000, size=len(procedimentos), replace=False)
+    amb = [f"{c // 1000000 % 100:02d}.{c // 10000 % 100:02d}.{c // 10 % 1000:03d}-{c % 10}"
+           for c in rng.integers(10000000, 99999999, size=len(procedimentos))]
+
+    total_prestadores = max(50, linhas // 20)
+    tipos = rng.integers(len(TIPOS_PRESTADOR), size=total_prestadores)
+    nomes = rng.integers(len(NOMES_PRESTADOR), size=total_prestadores)
+    prestadores = [f"{TIPOS_PRESTADOR[t]} {NOMES_PRESTADOR[n]} - UNIDADE {i + 1}"
+                   for i, (t, n) in enumerate(zip(tipos, nomes))]
+    raiz_cnpj = 10000000 + rng.choice(90000000, size=total_prestadores, replace=False)
+    cnpjs = [f"{r // 1000000:02d}.{r // 1000 % 1000:03d}.{r % 1000:03d}/0001-{r % 97:02d}" for r in raiz_cnpj]
+    return {
+        'procedimentos': np.array(procedimentos, dtype=object),
+        'tuss': tuss,
+        'amb': np.array(amb, dtype=object),
+        'prestadores': np.array(prestadores, dtype=object),
+        'razoes': np.array([f"{nome} LTDA" for nome in prestadores], dtype=object),
+        'cnpjs': np.array(cnpjs, dtype=object),
+        'zonas': np.array(ZONAS, dtype=object)[rng.integers(len(ZONAS), size=total_prestadores)],
+        'codigos_pessoa': rng.integers(100000, 999999, size=total_prestadores),
+    }
+
+
+def gerar_planilha(caminho, linhas, semente):
+    """
+    Gera (de forma determinística para a mesma semente) uma planilha com 'linhas' linhas na aba
+    PROCEDIMENTOS, combinando prestadores e procedimentos sorteados dos catálogos.
+    """
+    rng = np.random.default_rng(semente)
+    catalogos = _catalogos(rng, linhas)
+    prestador = rng.integers(len(catalogos['prestadores']), size=linhas)
+    procedimento = rng.integers(len(catalogos['procedimentos']), size=linhas)
+    colunas = [
+        catalogos['prestadores'][prestador],
+        catalogos['procedimentos'][procedimento],
+        catalogos['tuss'][procedimento],
+        catalogos['amb'][procedimento],
+        catalogos['cnpjs'][prestador],
+        catalogos['razoes'][prestador],
+        catalogos['zonas'][prestador],
+        catalogos['codigos_pessoa'][prestador],
+    ]
+    livro = Workbook(write_only=True)
+    aba = livro.create_sheet(NOME_ABA)
+    aba.append(COLUNAS)
+    for linha in zip(*(coluna.tolist() for coluna in colunas)):
+        aba.append(linha)
+    caminho_temporario = f"{caminho}.tmp"
+    livro.save(caminho_temporario)
+    os.replace(caminho_temporario, caminho)
+
+
+def montar_consultas(semente, linhas, quantidade):
+    """
+    Monta a mistura de consultas de cada tipo a partir dos mesmos catálogos da planilha:
+    'codigo' (TUSS inteiro, prefixo de TUSS e CNPJ), 'nome' (procedimentos e prestadores),
+    'erro_digitacao' (palavras com uma letra trocada, omitida ou invertida) e 'filtro'
+    (termo com filtro de zona e consultas estruturadas). Retorna tuplas (tipo, termo, filtros).
+    """
+    rng = np.random.default_rng(semente)
+    catalogos = _catalogos(rng, linhas)
+    rng = np.random.default_rng(semente + 1)
+    consultas = []
+    for i in range(quantidade):
+        # Códigos: TUSS completo, prefixo de 5 dígitos e CNPJ formatado, alternadamente.
+        tuss = str(catalogos['tuss'][rng.integers(len(catalogos['tuss']))])
+        cnpj = catalogos['cnpjs'][rng.integers(len(catalogos['cnpjs']))]
+        consultas.append(('codigo', [tuss, tuss[:5], cnpj][i % 3], None))
+
+        palavra = PALAVRAS_BUSCA[rng.integers(len(PALAVRAS_BUSCA))]
+        consultas.append(('nome', palavra, None))
+
+        # Erro de digitação em uma palavra longa (sempre com 5+ letras, para ainda ser reconhecível).
+        longas = [p for p in PALAVRAS_BUSCA if len(p) >= 7]
+        alvo = longas[rng.integers(len(longas))]
+        posicao = int(rng.integers(1, len(alvo) - 2))
+        erro = [alvo[:posicao] + alvo[posicao + 1:],  # Letra omitida.
+                alvo[:posicao] + alvo[posicao + 1] + alvo[posicao] + alvo[posicao + 2:],  # Letras invertidas.
+                alvo[:posicao] + 'x' + alvo[posicao + 1:]][i % 3]  # Letra trocada.
+        consultas.append(('erro_digitacao', erro, None))
+
+        zona = ZONAS[rng.integers(len(ZONAS))]
+        filtro = [(palavra, {'ZONA/REGIÃO': zona}),
+                  (f"zona:{zona.split()[-1].lower()} {palavra}", None),
+                  (f'"{palavra}" -contraste', None)][i % 3]
+        consultas.append(('filtro',) + filtro)
+    return consultas
+
+
+# =================================================================================
+# MEDIÇÃO (PROCESSO FILHO)
+# =================================================================================
+
+def pico_memoria_mb():
+    """Retorna o pico de memória residente (RSS) do processo, em MB, ou None se não houver como medir."""
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é informado em bytes no macOS e em KB nos demais sistemas.
+        return round(pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024, 1)
+    try:
+        import psutil  # Opcional: pico do conjunto de trabalho no Windows.
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def _percentis(valores):
+    """Resumo (total, média, p50/p95/p99 e máximo, em ms) de uma lista de durações em segundos."""
+    valores = np.array(valores, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(valores, [50, 95, 99])
+    return {'total': len(valores), 'media_ms': round(float(valores.mean()), 3), 'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3), 'p99_ms': round(float(p99), 3), 'max_ms': round(float(valores.max()), 3)}
+
+
+def medir_planilha(caminho, linhas, semente, quantidade, repeticoes):
+    """
+    Mede uma planilha: carregamento completo (sem snapshot), carregamento pelo snapshot e a
+    repetição da mistura de consultas (depois de uma passada de aquecimento). Retorna o dicionário de resultados do tamanho.
+    """
+    # Importado aqui: o processo principal não carrega o mecanismo.
+    from mkacete import MecanismoBuscaAvancado, MetricasDesempenho
+
+    caminho_snapshot = f"{caminho}.snapshot.pkl"
+    if os.path.exists(caminho_snapshot):
+        os.remove(caminho_snapshot)  # O primeiro carregamento é sempre completo (leitura + preparo).
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        buscador = MecanismoBuscaAvancado(caminho, CONFIG_BENCHMARK)
+        carregamento = time.perf_counter() - inicio
+        preparo = buscador.metricas.resumo('preparo')
+        del buscador
+        inicio = time.perf_counter()
+        buscador = MecanismoBuscaAvancado(caminho, CONFIG_BENCHMARK)
+        carregamento_snapshot = time.perf_counter() - inicio
+    if buscador.dados_abas.get(NOME_ABA) is None:
+        raise RuntimeError(f"a planilha '{caminho}' não pôde ser carregada")
+
+    consultas = montar_consultas(semente, linhas, quantidade)
+    latencias = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Aquecimento (não medido): memorizações e caches internos do Python e do pandas.
+        for _, termo, filtros in consultas:
+            buscador.buscar_avancada(NOME_ABA, termo, filtros)
+    buscador.metricas = MetricasDesempenho()
+    inicio_consultas = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            for tipo, termo, filtros in consultas:
+                inicio = time.perf_counter()
+                buscador.buscar_avancada(NOME_ABA, termo, filtros)
+                latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+    duracao_consultas = time.perf_counter() - inicio_consultas
+    total_consultas = len(consultas) * repeticoes
+
+    etapas = {etapa: buscador.metricas.resumo(etapa) for etapa in ETAPAS_MEDIDAS}
+    etapas['preparo'] = preparo  # O preparo ocorreu no primeiro mecanismo (sem snapshot).
+    return {
+        'linhas': linhas,
+        'carregamento_s': round(carregamento, 3),
+        'carregamento_snapshot_s': round(carregamento_snapshot, 3),
+        'consultas_executadas': total_consultas,
+        'vazao_consultas_s': round(total_consultas / duracao_consultas, 1),
+        'consultas': {tipo: _percentis(valores) for tipo, valores in latencias.items()},
+        'etapas': {etapa: resumo for etapa, resumo in etapas.items() if resumo is not None},
+        'pico_memoria_mb': pico_memoria_mb(),
+    }
+
+
+# =================================================================================
+# EXECUÇÃO E COMPARAÇÃO
+# =================================================================================
+
+def executar(argumentos):
+    """Gera as planilhas que faltam, mede cada tamanho em um processo filho e grava os resultados."""
+    os.makedirs(argumentos.pasta, exist_ok=True)
+    resultados = []
+    for linhas in argumentos.tamanhos:
+        caminho = os.path.join(argumentos.pasta, f"sintetica_{linhas}_s{argumentos.semente}.xlsx")
+        geracao = None
+        if not os.path.exists(caminho):
+            print(f"Gerando planilha sintética com {linhas} linhas...", flush=True)
+            inicio = time.perf_counter()
+            gerar_planilha(caminho, linhas, argumentos.semente)
+            geracao = round(time.perf_counter() - inicio, 3)
+
+        print(f"Medindo {linhas} linhas...", flush=True)
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--interno', caminho, '--linhas', str(linhas),
+             '--semente', str(argumentos.semente), '--consultas', str(argumentos.consultas),
+             '--repeticoes', str(argumentos.repeticoes)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8')
+        if processo.returncode != 0:
+            print(f"Falha ao medir {linhas} linhas:\n{processo.stderr.strip()}")
+            continue
+        resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+        resultado['geracao_s'] = geracao
+        resultados.append(resultado)
+        consultas = resultado['consultas']
+        print(f"  carregamento {resultado['carregamento_s']:.2f}s (snapshot {resultado['carregamento_snapshot_s']:.2f}s), "
+              f"vazão {resultado['vazao_consultas_s']:.1f} consultas/s, pico {resultado['pico_memoria_mb']} MB")
+        for tipo, resumo in consultas.items():
+            print(f"  {tipo}: p50 {resumo['p50_ms']:.2f} ms, p95 {resumo['p95_ms']:.2f} ms, p99 {resumo['p99_ms']:.2f} ms")
+
+    saida = argumentos.saida or os.path.join(
+        'benchmark_resultados', f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(saida) or '.', exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            'versao': VERSAO_RESULTADOS,
+            'momento': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'semente': argumentos.semente,
+            'consultas_por_tipo': argumentos.consultas,
+            'repeticoes': argumentos.repeticoes,
+            'resultados': resultados,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em '{saida}'.")
+
+
+def _metricas_comparaveis(resultado):
+    """Achata o resultado de um tamanho em pares (métrica, valor, maior_é_melhor)."""
+    metricas = [('carregamento_s', resultado.get('carregamento_s'), False),
+                ('carregamento_snapshot_s', resultado.get('carregamento_snapshot_s'), False),
+                ('pico_memoria_mb', resultado.get('pico_memoria_mb'), False),
+                ('vazao_consultas_s', resultado.get('vazao_consultas_s'), True)]
+    for grupo in ('consultas', 'etapas'):
+        for nome, resumo in resultado.get(grupo, {}).items():
+            for percentil in ('p50_ms', 'p95_ms', 'p99_ms'):
+                metricas.append((f"{grupo}.{nome}.{percentil}", resumo.get(percentil), False))
+    return metricas
+
+
+def comparar(caminho_antes, caminho_depois, tolerancia=10.0):
+    """Compara duas execuções, tamanho a tamanho, indicando melhoras e pioras acima da tolerância (%)."""
+    with open(caminho_antes, encoding='utf-8') as f:
+        antes = {r['linhas']: r for r in json.load(f)['resultados']}
+    with open(caminho_depois, encoding='utf-8') as f:
+        depois = {r['linhas']: r for r in json.load(f)['resultados']}
+    pioras = 0
+    for linhas in sorted(set(antes) & set(depois)):
+        print(f"\n=== {linhas} linhas ===")
+        valores_depois = {nome: valor for nome, valor, _ in _metricas_comparaveis(depois[linhas])}
+        for nome, valor_antes, maior_melhor in _metricas_comparaveis(antes[linhas]):
+            valor_depois = valores_depois.get(nome)
+            if not valor_antes or valor_depois is None:
+                continue
+            variacao = 100.0 * (valor_depois - valor_antes) / valor_antes
+            situacao = ''
+            if abs(variacao) >= tolerancia:
+                melhorou = (variacao > 0) == maior_melhor
+                situacao = 'melhor' if melhorou else 'PIOR'
+                pioras += not melhorou
+            print(f"  {nome:<40} {valor_antes:>12.3f} {valor_depois:>12.3f} {variacao:>+8.1f}%  {situacao}")
+    print(f"\n{pioras} métrica(s) pioraram mais de {tolerancia:.0f}%.")
+    return pioras
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do mecanismo de busca do MKACETE.')
+    parser.add_argument('--tamanhos', default=','.join(map(str, TAMANHOS_PADRAO)),
+                        help='Números de linhas das planilhas sintéticas, separados por vírgula.')
+    parser.add_argument('--consultas', type=int, default=40, help='Consultas de cada tipo na mistura.')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições da mistura de consultas.')
+    parser.add_argument('--semente', type=int, default=42, help='Semente dos dados e das consultas.')
+    parser.add_argument('--pasta', default='benchmark_dados', help='Pasta das planilhas sintéticas geradas.')
+    parser.add_argument('--saida', help='Arquivo JSON dos resultados (padrão: benchmark_resultados/).')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'), help='Compara dois resultados.')
+    parser.add_argument('--tolerancia', type=float, default=10.0, help='Variação (%%) destacada na comparação.')
+    parser.add_argument('--interno', help=argparse.SUPPRESS)
+    parser.add_argument('--linhas', type=int, help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.comparar:
+        sys.exit(1 if comparar(*argumentos.comparar, tolerancia=argumentos.tolerancia) else 0)
+    if argumentos.interno:
+        # Processo filho: mede uma planilha e devolve o resultado em uma linha JSON.
+        resultado = medir_planilha(argumentos.interno, argumentos.linhas, argumentos.semente,
+                                   argumentos.consultas, argumentos.repeticoes)
+        print(json.dumps(resultado, ensure_ascii=False))
+        return
+    argumentos.tamanhos = [int(tamanho) for tamanho in argumentos.tamanhos.split(',') if tamanho.strip()]
+    executar(argumentos)
+
+
+if __name__ == '__main__':
+    main()
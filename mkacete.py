@@ -13,6 +13,30 @@ import json  # Manipulação de dados no formato JSON, usado para o arquivo de c
 import warnings  # Para ignorar avisos de bibliotecas que não afetam o funcionamento do script.
 import colorama  # Permite estilizar a saída do terminal com cores em diferentes sistemas operacionais.
 import pyperclip  # Ferramenta para copiar texto para a área de transferência do sistema.
+import re  # Expressões regulares, usadas para compilar as alternativas (OU) da correspondência literal.
+import functools  # Memorização dos motores de correspondência literal já compilados.
+import bisect  # Busca binária em listas ordenadas, usada nas consultas por prefixo do índice invertido.
+import numpy as np  # Operações vetorizadas sobre listas de posições (postings) de linhas.
+import pickle  # Serialização do snapshot em disco com os dados já preparados para busca.
+import hashlib  # Hash do conteúdo da planilha, usado como chave do snapshot.
+import threading  # Aquecimento das abas em segundo plano no modo de carregamento sob demanda.
+from collections import OrderedDict, deque  # LRU do cache de resultados e janelas de amostras das métricas.
+import contextlib  # Gerenciador de contexto que mede a duração de cada etapa da busca.
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor  # Pools da busca global entre abas.
+import concurrent.futures  # Espera com prazo pelos resultados das abas na busca global em processos.
+import select  # Detecta, sem bloquear, um novo termo digitado enquanto uma busca está em andamento.
+import signal  # Os processos da busca global ignoram o Ctrl+C, tratado pelo processo principal.
+import asyncio  # Laço de eventos do servidor local (várias conexões atendidas ao mesmo tempo).
+import argparse  # Argumentos da linha de comando (modos terminal, servidor e cliente).
+import urllib.parse  # Caminho e parâmetros das requisições recebidas pelo servidor local.
+import urllib.request  # Requisições do terminal (modo cliente) ao servidor local.
+import urllib.error  # Erros HTTP e de conexão do modo cliente.
+import csv  # Leitura das consultas e gravação dos resultados do processamento em lote.
+from openpyxl import Workbook  # Gravação em fluxo (write_only) dos resultados do lote em XLSX.
+try:
+    import msvcrt  # Teclado do console do Windows (detecta digitação durante uma busca em andamento).
+except ImportError:
+    msvcrt = None
 
 # =================================================================================
 # BLOCO 2: DADOS E CONSTANTES
@@ -285,6 +309,816 @@ class Colors:
     ENDC = '\033[0m'  # Código para resetar as cores e estilos.
 
 
+class CacheResultados:
+    """
+    Cache de resultados de busca com remoção LRU (menos usado recentemente), validade opcional
+    (TTL) e orçamento de memória em bytes, estimado pelo 'memory_usage' dos DataFrames.
+    Mantém contadores de acertos, falhas, remoções e expirações para o relatório de status.
+    """
+
+    def __init__(self, max_entradas, max_bytes=None, ttl_segundos=None):
+        """Cria o cache com os limites informados (None ou 0 desativa o limite correspondente)."""
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes or None
+        self.ttl_segundos = ttl_segundos or None
+        self._entradas = OrderedDict()  # chave -> (valor, tamanho em bytes, instante de gravação)
+        self._trava = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.expiracoes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @staticmethod
+    def _estimar_bytes(valor):
+        """Estima o tamanho em memória de um resultado (DataFrame) armazenado no cache."""
+        if isinstance(valor, pd.DataFrame):
+            return int(valor.memory_usage(index=True, deep=True).sum())
+        if isinstance(valor, (tuple, list)):
+            return sum(CacheResultados._estimar_bytes(item) for item in valor)
+        return sys.getsizeof(valor)
+
+    def obter(self, chave, aceitar=None):
+        """
+        Retorna o valor armazenado (marcando-o como usado recentemente) ou None em caso de falha.
+        'aceitar' é uma função opcional que decide se o valor encontrado atende ao pedido.
+        """
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is None or (aceitar is not None and not aceitar(entrada[0])):
+                self.falhas += 1
+                return None
+            valor, tamanho, gravado_em = entrada
+            if self.ttl_segundos and time.monotonic() - gravado_em > self.ttl_segundos:
+                # Entrada vencida: é descartada e conta como falha.
+                self._remover(chave)
+                self.expiracoes += 1
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def espiar(self, chave):
+        """Retorna o valor armazenado sem alterar a ordem LRU nem os contadores (None se ausente ou vencido)."""
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is None or (self.ttl_segundos and time.monotonic() - entrada[2] > self.ttl_segundos):
+                return None
+            return entrada[0]
+
+    def guardar(self, chave, valor):
+        """Armazena o valor, removendo as entradas menos usadas até respeitar os limites."""
+        tamanho = self._estimar_bytes(valor)
+        if self.max_bytes and tamanho > self.max_bytes:
+            return  # Um único resultado maior que todo o orçamento não é armazenado.
+        with self._trava:
+            if chave in self._entradas:
+                self._remover(chave)
+            self._entradas[chave] = (valor, tamanho, time.monotonic())
+            self.bytes_usados += tamanho
+            while self._entradas and (
+                    len(self._entradas) > self.max_entradas
+                    or (self.max_bytes and self.bytes_usados > self.max_bytes)):
+                self._remover(next(iter(self._entradas)))
+                self.remocoes += 1
+
+    def _remover(self, chave):
+        """Remove uma entrada e desconta seu tamanho (chamado com a trava adquirida)."""
+        _, tamanho, _ = self._entradas.pop(chave)
+        self.bytes_usados -= tamanho
+
+    def invalidar(self, condicao):
+        """Remove as entradas cuja chave atende à condição e retorna quantas foram removidas."""
+        with self._trava:
+            chaves = [chave for chave in self._entradas if condicao(chave)]
+            for chave in chaves:
+                self._remover(chave)
+            return len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas do cache (os contadores são mantidos)."""
+        with self._trava:
+            self._entradas.clear()
+            self.bytes_usados = 0
+
+
+class NormalizadorTexto:
+    """
+    Normaliza colunas de texto em lote (minúsculas + remoção de acentos). O 'unidecode' roda
+    uma única vez por valor distinto: valores repetidos (ZONA, REGIÃO, PRESTADOR...) são
+    codificados com 'pd.factorize' e os resultados ficam memorizados entre colunas e abas.
+    """
+
+    def __init__(self):
+        """Inicializa o dicionário de memorização (valor original -> valor normalizado)."""
+        self.memoria = {}
+
+    def normalizar(self, valor):
+        """Normaliza um único valor, reutilizando o resultado memorizado quando existir."""
+        normalizado = self.memoria.get(valor)
+        if normalizado is None:
+            normalizado = unidecode(valor.lower()) if valor else ''
+            self.memoria[valor] = normalizado
+        return normalizado
+
+    def normalizar_serie(self, serie):
+        """Normaliza uma coluna inteira processando apenas seus valores distintos."""
+        codigos, unicos = pd.factorize(serie.astype(str))
+        normalizados = np.array([self.normalizar(valor) for valor in unicos], dtype=object)
+        return pd.Series(normalizados[codigos], index=serie.index, name=serie.name)
+
+    @staticmethod
+    def texto_consolidado(df):
+        """
+        Monta a coluna '_TEXTO_BUSCA' concatenando colunas inteiras (sem iterar linhas): os valores
+        não vazios de cada linha são unidos por espaço, na ordem das colunas.
+        """
+        texto = np.full(len(df), '', dtype=object)
+        for col in df.columns:
+            valores = df[col].astype(str)
+            preenchido = (valores.str.strip() != '').to_numpy(dtype=bool)
+            if not preenchido.any():
+                continue
+            valores = valores.to_numpy(dtype=object)
+            # Linhas ainda vazias recebem o valor; as demais recebem ' ' + valor.
+            inicio = preenchido & (texto == '')
+            continuacao = preenchido & ~inicio
+            texto[inicio] = valores[inicio]
+            texto[continuacao] = texto[continuacao] + ' ' + valores[continuacao]
+        return pd.Series(texto, index=df.index, dtype=object)
+
+
+class TextoConsolidado:
+    """
+    Armazenamento compacto do '_TEXTO_BUSCA' de uma aba: em vez de um objeto string por linha
+    (cabeçalho do objeto + ponteiro na coluna), os textos ficam em uma única string, separados
+    por '\x00', com o deslocamento inicial de cada linha em um vetor de inteiros. O texto de uma
+    linha é gerado sob demanda, apenas para as linhas que a busca precisa verificar.
+    """
+
+    _SEPARADOR = '\x00'
+
+    def __init__(self, serie_texto):
+        """Concatena os textos das linhas (na ordem dos ids) e calcula o deslocamento de cada uma."""
+        valores = serie_texto.to_numpy(dtype=object)
+        self.texto = self._SEPARADOR.join(valores)
+        tamanhos = np.fromiter((len(valor) + 1 for valor in valores), dtype=np.int64, count=len(valores))
+        inicios = np.concatenate([[0], np.cumsum(tamanhos)])
+        self.inicios = inicios.astype(np.int32) if inicios[-1] < np.iinfo(np.int32).max else inicios
+
+    def __len__(self):
+        return len(self.inicios) - 1
+
+    @property
+    def bytes(self):
+        """Memória ocupada pelo texto concatenado e pelos deslocamentos, em bytes."""
+        return sys.getsizeof(self.texto) + self.inicios.nbytes
+
+    def serie(self, linhas=None):
+        """Retorna os textos das linhas (ids) informadas, ou de todas, como Series indexada pelos ids."""
+        if linhas is None:
+            valores = self.texto.split(self._SEPARADOR) if len(self) else []
+            return pd.Series(valores, index=pd.RangeIndex(len(self)), dtype=object)
+        linhas = np.asarray(linhas, dtype=np.int64)
+        inicios, fins = self.inicios[linhas].tolist(), (self.inicios[linhas + 1] - 1).tolist()
+        texto = self.texto
+        return pd.Series([texto[i:f] for i, f in zip(inicios, fins)], index=linhas, dtype=object)
+
+
+class CorrespondenciaLiteral:
+    """
+    Motor de correspondência literal (sem semântica de regex) de um ou mais trechos de texto.
+    Uma linha casa quando contém todos os trechos obrigatórios (E) e, se houver alternativos,
+    pelo menos um deles (OU). As alternativas são compiladas uma única vez em um único padrão
+    com os trechos escapados, percorrido em uma só passada por linha; os obrigatórios são
+    verificados do mais longo (mais seletivo) para o mais curto, apenas nas linhas que ainda
+    podem casar.
+    """
+
+    def __init__(self, obrigatorios=(), alternativos=()):
+        self.obrigatorios = tuple(sorted(dict.fromkeys(t for t in obrigatorios if t), key=len, reverse=True))
+        self.alternativos = tuple(dict.fromkeys(t for t in alternativos if t))
+        self._padrao_alternativos = None
+        if len(self.alternativos) > 1:
+            # Trechos mais longos primeiro: o padrão reconhece a alternativa mais específica.
+            trechos = sorted(self.alternativos, key=len, reverse=True)
+            self._padrao_alternativos = re.compile('|'.join(re.escape(t) for t in trechos))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def do_termo(termo):
+        """
+        Monta (ou reaproveita) o motor de um termo de busca já normalizado. O caractere '|' separa
+        alternativas (OU); qualquer outro caractere, como '(', '+' ou '.', é procurado literalmente.
+        """
+        alternativos = [parte.strip() for parte in termo.split('|') if parte.strip()]
+        if len(alternativos) > 1:
+            return CorrespondenciaLiteral(alternativos=alternativos)
+        return CorrespondenciaLiteral(obrigatorios=[alternativos[0] if alternativos else termo])
+
+    @property
+    def simples(self):
+        """Indica se o motor procura um único trecho (permite reaproveitar buscas por prefixo)."""
+        return len(self.obrigatorios) == 1 and not self.alternativos
+
+    def mascara(self, textos):
+        """Retorna um array booleano indicando as linhas da série 'textos' que casam com o motor."""
+        vivas = np.ones(len(textos), dtype=bool)
+        etapas = [(trecho, False) for trecho in self.obrigatorios]
+        if self._padrao_alternativos is not None:
+            etapas.append((self._padrao_alternativos, True))
+        elif self.alternativos:
+            etapas.append((self.alternativos[0], False))
+        for padrao, usa_padrao in etapas:
+            posicoes = np.flatnonzero(vivas)
+            if not len(posicoes):
+                break
+            # Apenas as linhas que ainda podem casar são verificadas.
+            alvo = textos if len(posicoes) == len(textos) else textos.iloc[posicoes]
+            vivas[posicoes] = alvo.str.contains(padrao, regex=usa_padrao, na=False).to_numpy(dtype=bool)
+        return vivas
+
+
+class ConsultaEstruturada:
+    """
+    Consulta interpretada a partir do texto digitado. Além do termo livre, aceita:
+      campo:valor       filtra a coluna 'campo' pelo trecho 'valor' (ex.: zona:norte);
+      "trecho exato"    exige a frase inteira, com as palavras na mesma ordem;
+      -termo            exclui as linhas que contêm o termo (também -campo:valor e -"frase").
+    Valores entre aspas podem ter espaços (prestador:"clinica sao"). As palavras restantes formam
+    o termo livre, procurado como antes (um único trecho contínuo). Um texto sem nenhuma dessas
+    construções é mantido exatamente como foi digitado.
+    """
+
+    # Sinal de exclusão opcional, nome do campo opcional e valor entre aspas ou palavra simples.
+    _PADRAO_CLAUSULA = re.compile(r'(-?)(?:([a-z_][\w.]*):)?(?:"([^"]*)"?|(\S+))')
+
+    def __init__(self, termo, frases=(), exclusoes=(), campos=()):
+        self.termo = termo  # Termo livre, usado nas buscas exata, por relevância e fuzzy.
+        self.frases = list(frases)  # Frases obrigatórias em qualquer parte da linha.
+        self.exclusoes = list(exclusoes)  # Trechos que eliminam a linha.
+        self.campos = list(campos)  # Tuplas (campo, valor, excluir) restritas a uma coluna.
+
+    @property
+    def estruturada(self):
+        """Indica se a consulta possui cláusulas além do termo livre."""
+        return bool(self.frases or self.exclusoes or self.campos)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def interpretar(texto):
+        """Interpreta um texto já normalizado (minúsculo e sem acentos) e retorna a consulta."""
+        palavras, frases, exclusoes, campos = [], [], [], []
+        for correspondencia in ConsultaEstruturada._PADRAO_CLAUSULA.finditer(texto):
+            sinal, campo, entre_aspas, palavra = correspondencia.groups()
+            valor = (entre_aspas if entre_aspas is not None else palavra).strip()
+            if not valor:
+                continue
+            if campo:
+                campos.append((campo, valor, bool(sinal)))
+            elif sinal:
+                exclusoes.append(valor)
+            elif entre_aspas is not None:
+                frases.append(valor)
+            else:
+                palavras.append(valor)
+        consulta = ConsultaEstruturada(' '.join(palavras), frases, exclusoes, campos)
+        if not consulta.estruturada:
+            return ConsultaEstruturada(texto)
+        if not consulta.termo and frases:
+            # Sem termo livre, a primeira frase ordena os resultados.
+            consulta.termo = frases[0]
+        return consulta
+
+
+class IndiceInvertido:
+    """
+    Índice invertido de uma aba, construído uma única vez no carregamento dos dados.
+    Mapeia cada palavra (token) normalizada da coluna '_TEXTO_BUSCA' para as posições
+    das linhas onde ela aparece, e mantém uma lista ordenada com os sufixos do
+    vocabulário para responder consultas por prefixo/trecho de palavra via busca binária.
+    """
+
+    # Caractere máximo do Unicode, usado como limite superior nas faixas de prefixo.
+    _LIMITE_PREFIXO = '\U0010ffff'
+
+    def __init__(self, serie_texto):
+        """Constrói os postings (palavra -> linhas) e a lista de sufixos a partir de '_TEXTO_BUSCA'."""
+        self.total_linhas = len(serie_texto)
+        tokens = serie_texto.str.split().explode()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        pares = pd.DataFrame({'token': tokens.values, 'linha': tokens.index.values}).drop_duplicates()
+        # Palavra -> array ordenado com as posições das linhas que a contêm.
+        self.postings = {
+            token: np.sort(grupo.to_numpy(dtype=np.int64))
+            for token, grupo in pares.groupby('token', sort=False)['linha']
+        }
+        self.vocabulario = list(self.postings.keys())
+        # Todos os sufixos de cada palavra, ordenados: um prefixo de sufixo é um trecho da palavra.
+        sufixos = sorted(
+            (token[i:], id_token)
+            for id_token, token in enumerate(self.vocabulario)
+            for i in range(len(token))
+        )
+        self.sufixos = [sufixo for sufixo, _ in sufixos]
+        self.sufixo_token = [id_token for _, id_token in sufixos]
+
+    def _linhas_com_trecho(self, trecho):
+        """Retorna as linhas que possuem alguma palavra contendo o trecho informado."""
+        inicio = bisect.bisect_left(self.sufixos, trecho)
+        fim = bisect.bisect_left(self.sufixos, trecho + self._LIMITE_PREFIXO, inicio)
+        ids_tokens = set(self.sufixo_token[inicio:fim])
+        if not ids_tokens:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.postings[self.vocabulario[i]] for i in ids_tokens]))
+
+    def candidatos(self, termo):
+        """
+        Retorna as posições das linhas que podem conter o termo como trecho de '_TEXTO_BUSCA'.
+        O resultado é um superconjunto das linhas que casam (deve ser confirmado pela busca
+        exata), ou None quando o termo não possui palavras e o índice não pode ser usado.
+        """
+        partes = termo.split()
+        if not partes:
+            return None
+        linhas = None
+        for posicao, parte in enumerate(partes):
+            if 0 < posicao < len(partes) - 1:
+                # Palavras do meio do termo precisam existir inteiras no texto.
+                linhas_parte = self.postings.get(parte, np.empty(0, dtype=np.int64))
+            else:
+                # A primeira e a última palavra podem ser apenas um trecho de uma palavra do texto.
+                linhas_parte = self._linhas_com_trecho(parte)
+            linhas = linhas_parte if linhas is None else np.intersect1d(linhas, linhas_parte, assume_unique=True)
+            if not len(linhas):
+                break
+        return linhas
+
+
+class IndiceFiltros:
+    """
+    Índice dos filtros por coluna de uma aba. Cada coluna de texto com poucos valores distintos
+    (como ZONA, REGIÃO ou PRESTADOR) é codificada em inteiros (um código por valor distinto) e
+    guarda, para cada código, a lista ordenada das linhas onde ele aparece (postings em um único
+    array, no formato CSR). Um filtro testa o trecho apenas nos valores distintos e une as listas
+    dos valores que casam; filtros de colunas diferentes são combinados por interseção.
+    """
+
+    # Colunas com mais valores distintos que esta fração das linhas não são indexadas.
+    _FRACAO_MAXIMA_DISTINTOS = 0.5
+
+    def __init__(self, df):
+        """Codifica as colunas de texto de baixa cardinalidade e monta as listas de linhas por valor."""
+        self.total_linhas = len(df)
+        self.colunas = {}
+        for col in df.columns:
+            if col == '_TEXTO_BUSCA' or df[col].dtype != 'object':
+                continue
+            codigos, valores = pd.factorize(df[col])
+            if len(valores) > self._FRACAO_MAXIMA_DISTINTOS * len(df):
+                continue
+            # Linhas ordenadas por código (e pela posição dentro de cada código) e o início de cada código.
+            linhas = np.argsort(codigos, kind='stable').astype(np.int64)
+            inicios = np.searchsorted(codigos[linhas], np.arange(len(valores) + 1))
+            self.colunas[col] = (pd.Series(valores, dtype=object), linhas, inicios)
+
+    def linhas(self, coluna, motor):
+        """
+        Retorna as posições (ordenadas) das linhas cujo valor na coluna casa com o motor de
+        correspondência literal, ou None se a coluna não estiver indexada.
+        """
+        if coluna not in self.colunas:
+            return None
+        valores, linhas, inicios = self.colunas[coluna]
+        codigos = np.flatnonzero(motor.mascara(valores))
+        if not len(codigos):
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([linhas[inicios[c]:inicios[c + 1]] for c in codigos]))
+
+
+class IndiceCodigos:
+    """
+    Índice dos códigos de uma aba (TUSS, AMB, CBHPM, CNPJ...), construído no carregamento sobre as
+    colunas de código. Cada célula é quebrada em códigos numéricos (sem a pontuação de CNPJ, como
+    '.', '/' e '-'); um dicionário responde códigos exatos em O(1) e uma lista ordenada dos códigos
+    responde prefixos por busca binária.
+    """
+
+    # Pontuação entre dígitos removida antes de extrair os códigos (ex.: 12.345.678/0001-90).
+    _PONTUACAO_CODIGO = re.compile(r'(?<=\d)[./-](?=\d)')
+    _CODIGO = re.compile(r'\d+')
+
+    def __init__(self, df, colunas):
+        """Extrai os códigos das colunas informadas e monta o dicionário código -> linhas."""
+        self.total_linhas = len(df)
+        self.colunas = [col for col in colunas if col in df.columns]
+        pares = []
+        for col in self.colunas:
+            textos = df[col].astype(str).str.replace(self._PONTUACAO_CODIGO, '', regex=True)
+            codigos = textos.str.findall(self._CODIGO).explode().dropna()
+            pares.append(pd.DataFrame({'codigo': codigos.values, 'linha': codigos.index.values}))
+        self.postings = {}
+        if pares:
+            pares = pd.concat(pares, ignore_index=True).drop_duplicates()
+            self.postings = {
+                codigo: np.sort(grupo.to_numpy(dtype=np.int64))
+                for codigo, grupo in pares.groupby('codigo', sort=False)['linha']
+            }
+        self.ordenados = sorted(self.postings)
+
+    @classmethod
+    def normalizar_codigo(cls, termo):
+        """Retorna o termo como código (só dígitos, sem pontuação de CNPJ) ou None se não tiver formato de código."""
+        codigo = cls._PONTUACAO_CODIGO.sub('', termo.strip())
+        return codigo if len(codigo) >= 4 and codigo.isdigit() else None
+
+    def linhas(self, codigo):
+        """
+        Retorna as linhas com o código exato, seguidas (sem repetição) das linhas com códigos que
+        começam pelo termo, cada grupo na ordem original das linhas.
+        """
+        exatas = self.postings.get(codigo, np.empty(0, dtype=np.int64))
+        inicio = bisect.bisect_right(self.ordenados, codigo)  # O código exato já foi respondido pelo dicionário.
+        fim = bisect.bisect_left(self.ordenados, codigo + ':', inicio)  # ':' vem logo depois de '9'.
+        if inicio == fim:
+            return exatas
+        prefixo = np.unique(np.concatenate([self.postings[c] for c in self.ordenados[inicio:fim]]))
+        return np.concatenate([exatas, prefixo[~np.isin(prefixo, exatas)]])
+
+
+class IndiceFuzzy:
+    """
+    Motor de busca aproximada (fuzzy) em duas etapas sobre as colunas prioritárias de uma aba.
+    1) Um índice de trigramas de caracteres, criado no carregamento, seleciona apenas os valores
+       distintos que compartilham algum trigrama com o termo.
+    2) Os candidatos passam por limites superiores baratos (tamanho e contagem de caracteres)
+       antes do cálculo completo do SequenceMatcher.ratio(), descartando cedo quem não atinge o limiar.
+
+    Tolerância: as pontuações são exatamente as do SequenceMatcher.ratio() (diferença 0), pois o
+    cálculo final é o mesmo. A única diferença possível está na revocação: pares sem nenhum
+    trigrama em comum não são avaliados, mesmo que o ratio() atinja o limiar. Na BATMAN.xlsx isso
+    afetou cerca de 5% das linhas em buscas com erro de digitação, sempre em pares sem relação real
+    (e.g. 'retirad' x 'creatina', '10101012' x '41001125').
+    """
+
+    def __init__(self, df, colunas):
+        """Agrupa os valores distintos das colunas e indexa seus trigramas."""
+        self.total_linhas = len(df)
+        linhas_por_valor = {}
+        for col in colunas:
+            if col not in df.columns:
+                continue
+            textos = df[col].astype(str)
+            textos = textos[textos.str.strip() != '']
+            for valor, linhas in textos.groupby(textos, sort=False).groups.items():
+                linhas_por_valor.setdefault(valor, []).append(np.asarray(linhas, dtype=np.int64))
+        # Valor distinto -> linhas onde aparece (em qualquer coluna prioritária).
+        self.valores = list(linhas_por_valor.keys())
+        self.linhas_valor = [np.unique(np.concatenate(partes)) for partes in linhas_por_valor.values()]
+        self.tamanhos = np.array([len(valor) for valor in self.valores], dtype=np.int64)
+        # Trigrama -> ids dos valores que o contêm.
+        trigramas_valor = {}
+        for id_valor, valor in enumerate(self.valores):
+            for trigrama in self._trigramas(valor):
+                trigramas_valor.setdefault(trigrama, []).append(id_valor)
+        self.trigramas = {trigrama: np.array(ids, dtype=np.int64) for trigrama, ids in trigramas_valor.items()}
+
+    @staticmethod
+    def _trigramas(texto):
+        """Retorna o conjunto de trigramas do texto, com espaços nas bordas para cobrir textos curtos."""
+        texto = f'  {texto} '
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    def similaridades(self, termo, limiar, cancelamento=None):
+        """
+        Retorna um array com a melhor similaridade de cada linha da aba (0 quando nenhuma célula
+        candidata atinge o limiar), calculada com SequenceMatcher apenas nos candidatos. Com um token
+        de cancelamento, ele é verificado a cada lote de candidatos.
+        """
+        melhores = np.zeros(self.total_linhas, dtype=np.float64)
+        ids = [self.trigramas[t] for t in self._trigramas(termo) if t in self.trigramas]
+        if not ids:
+            return melhores
+        candidatos = np.unique(np.concatenate(ids))
+        # Limite pelo tamanho (equivale ao real_quick_ratio): 2 * min(a, b) / (a + b).
+        tamanhos = self.tamanhos[candidatos]
+        limite_tamanho = 2.0 * np.minimum(tamanhos, len(termo)) / (tamanhos + len(termo))
+        candidatos = candidatos[limite_tamanho >= limiar]
+
+        for n, id_valor in enumerate(candidatos):
+            if cancelamento is not None and n % CancelamentoBusca.TAMANHO_LOTE == 0 and not cancelamento.continuar():
+                break  # Orçamento de tempo esgotado: mantém as similaridades já calculadas.
+            comparador = SequenceMatcher(None, termo, self.valores[id_valor])
+            # Saída antecipada: quick_ratio() é um limite superior barato do ratio().
+            if comparador.quick_ratio() < limiar:
+                continue
+            similaridade = comparador.ratio()
+            if similaridade >= limiar:
+                linhas = self.linhas_valor[id_valor]
+                melhores[linhas] = np.maximum(melhores[linhas], similaridade)
+        return melhores
+
+
+class MetricasDesempenho:
+    """
+    Instrumentação de desempenho com temporizadores monotônicos (time.perf_counter). Cada medição
+    de uma etapa (em uma aba ou geral) entra em uma janela com as amostras mais recentes, usada para
+    calcular média e percentis (p50/p95/p99). Opcionalmente, cada medição também é gravada como
+    uma linha JSON (JSON Lines), para comparar execuções e encontrar regressões nos dados reais.
+    """
+
+    # Etapas medidas, na ordem do relatório, com seus nomes de exibição.
+    ETAPAS = {
+        'carregamento': 'Carregamento',
+        'leitura': 'Leitura de aba',
+        'preparo': 'Preparo de aba',
+        'filtros': 'Filtros/consulta',
+        'codigo': 'Código',
+        'exata': 'Exata',
+        'relevancia': 'Relevância',
+        'fuzzy': 'Fuzzy',
+        'montagem': 'Montagem',
+        'combinacao': 'Combinação global',
+        'busca': 'Busca (sem cache)',
+        'busca_cache': 'Busca (cache)',
+        'busca_global': 'Busca global',
+        'exibicao': 'Exibição',
+        'consulta_lote': 'Consulta em lote',
+    }
+    TAMANHO_JANELA = 2048  # Amostras mantidas por etapa e aba (as mais antigas são descartadas).
+
+    def __init__(self, arquivo=None):
+        self.arquivo = arquivo or None  # Arquivo JSON Lines com cada medição (None = desativado).
+        self.amostras = {}  # (etapa, aba) -> durações mais recentes, em segundos.
+        self.contagens = {}  # (etapa, aba) -> total de medições, inclusive as que já saíram da janela.
+        self._trava = threading.Lock()
+        self._saida = None
+
+    @contextlib.contextmanager
+    def medir(self, etapa, aba=None, **dados):
+        """Mede a duração do bloco e a registra (blocos interrompidos por exceção não são registrados)."""
+        inicio = time.perf_counter()
+        yield
+        self.registrar(etapa, time.perf_counter() - inicio, aba, **dados)
+
+    def registrar(self, etapa, segundos, aba=None, **dados):
+        """Registra uma duração (em segundos) da etapa e, se configurado, grava a linha JSON correspondente."""
+        chave = (etapa, aba)
+        with self._trava:
+            janela = self.amostras.get(chave)
+            if janela is None:
+                janela = self.amostras[chave] = deque(maxlen=self.TAMANHO_JANELA)
+            janela.append(segundos)
+            self.contagens[chave] = self.contagens.get(chave, 0) + 1
+            if self.arquivo:
+                self._gravar({'momento': time.time(), 'etapa': etapa, 'aba': aba,
+                              'ms': round(segundos * 1000, 3), **dados})
+
+    def _gravar(self, registro):
+        """Acrescenta um registro ao arquivo JSON Lines; em caso de erro, a gravação é desativada."""
+        try:
+            if self._saida is None:
+                self._saida = open(self.arquivo, 'a', encoding='utf-8')
+            self._saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            self._saida.flush()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Métricas não serão gravadas em '{self.arquivo}': {e}{Colors.ENDC}")
+            self.arquivo = None
+
+    def abas(self, etapa):
+        """Retorna as abas com medições da etapa."""
+        with self._trava:
+            return [aba for nome, aba in self.amostras if nome == etapa and aba is not None]
+
+    def resumo(self, etapa, aba=None):
+        """
+        Retorna o total de medições e a média, os percentis (p50/p95/p99) e o máximo, em ms, de uma
+        etapa em uma aba, ou de todas as medições da etapa quando 'aba' é None. None se não houver medições.
+        """
+        with self._trava:
+            chaves = [chave for chave in self.amostras if chave[0] == etapa and (aba is None or chave[1] == aba)]
+            valores = np.array([valor for chave in chaves for valor in self.amostras[chave]], dtype=np.float64)
+            total = sum(self.contagens[chave] for chave in chaves)
+        if not len(valores):
+            return None
+        valores *= 1000
+        p50, p95, p99 = np.percentile(valores, [50, 95, 99])
+        return {'etapa': etapa, 'aba': aba, 'total': total, 'media_ms': round(float(valores.mean()), 3),
+                'p50_ms': round(float(p50), 3), 'p95_ms': round(float(p95), 3), 'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(valores.max()), 3)}
+
+    def resumos(self):
+        """Retorna os resumos de todas as etapas (geral) seguidos dos resumos por aba."""
+        gerais = [self.resumo(etapa) for etapa in self.ETAPAS]
+        por_aba = [self.resumo(etapa, aba) for etapa in self.ETAPAS for aba in self.abas(etapa)]
+        return [resumo for resumo in gerais + por_aba if resumo is not None]
+
+    def exportar(self, caminho):
+        """Grava os resumos (um por linha, em JSON Lines) no arquivo informado e retorna quantos foram gravados."""
+        resumos = self.resumos()
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for resumo in resumos:
+                f.write(json.dumps(resumo, ensure_ascii=False) + '\n')
+        return len(resumos)
+
+
+class BuscaCancelada(Exception):
+    """Sinaliza que uma busca foi cancelada (por uma busca mais nova ou pelo operador, com Ctrl+C)."""
+
+
+class CancelamentoBusca:
+    """
+    Token de cancelamento de uma busca, verificado entre os lotes de linhas de cada etapa.
+    'cancelar()' interrompe a busca no próximo lote (BuscaCancelada). O orçamento de tempo,
+    quando esgotado, encerra as etapas restantes e a busca devolve os resultados parciais já obtidos.
+    """
+
+    # Linhas (ou valores distintos, na busca fuzzy) processadas entre duas verificações do token.
+    TAMANHO_LOTE = 2000
+
+    def __init__(self, orcamento_segundos=0):
+        self._evento = threading.Event()
+        self.prazo = time.perf_counter() + orcamento_segundos if orcamento_segundos else None
+        self.esgotado = False  # O orçamento de tempo acabou antes do fim da busca.
+
+    def cancelar(self):
+        """Pede a interrupção da busca."""
+        self._evento.set()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+    def continuar(self):
+        """
+        Verifica o token: levanta BuscaCancelada se a busca foi cancelada e retorna False se o
+        orçamento de tempo se esgotou (a etapa deve parar e manter o que já encontrou).
+        """
+        if self._evento.is_set():
+            raise BuscaCancelada()
+        if not self.esgotado and self.prazo is not None and time.perf_counter() >= self.prazo:
+            self.esgotado = True
+        return not self.esgotado
+
+    def lotes(self, total):
+        """Gera as faixas (início, fim) de 'total' linhas em lotes, verificando o token antes de cada uma."""
+        for inicio in range(0, total, self.TAMANHO_LOTE):
+            if not self.continuar():
+                return
+            yield inicio, min(inicio + self.TAMANHO_LOTE, total)
+
+
+class ExecutorBuscas:
+    """
+    Executa as buscas em uma thread de trabalho, sem travar o terminal. Cada busca recebe um token
+    de cancelamento (CancelamentoBusca) com o orçamento de tempo configurado; submeter uma nova
+    busca cancela a anterior, que para no próximo lote de linhas e libera a thread.
+    """
+
+    def __init__(self, orcamento_segundos=0):
+        self.orcamento_segundos = orcamento_segundos  # Tempo máximo de cada busca (0 = sem limite).
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='busca')
+        self._token_atual = None
+        self._trava = threading.Lock()
+        self.canceladas = 0  # Buscas interrompidas por uma busca mais nova ou pelo operador.
+        self.parciais = 0  # Buscas que esgotaram o orçamento de tempo e devolveram resultados parciais.
+
+    def submeter(self, funcao, *args, **kwargs):
+        """
+        Agenda 'funcao(*args, cancelamento=token, **kwargs)', cancelando a busca anterior ainda em
+        andamento. Retorna o futuro da busca e o seu token.
+        """
+        token = CancelamentoBusca(self.orcamento_segundos)
+        with self._trava:
+            if self._token_atual is not None:
+                self._token_atual.cancelar()
+            self._token_atual = token
+        futuro = self._pool.submit(funcao, *args, cancelamento=token, **kwargs)
+        futuro.add_done_callback(self._contabilizar)
+        return futuro, token
+
+    def _contabilizar(self, futuro):
+        """Conta as buscas canceladas e as que terminaram com resultados parciais."""
+        if futuro.cancelled() or isinstance(futuro.exception(), BuscaCancelada):
+            self.canceladas += 1
+        elif futuro.exception() is None and getattr(futuro.result(), 'attrs', {}).get('parcial'):
+            self.parciais += 1
+
+
+class RenderizadorResultados:
+    """
+    Camada de exibição dos resultados no terminal. As linhas são formatadas em lote e cada página
+    é escrita de uma só vez (uma única escrita em vez de um print por campo, o que pesa bastante
+    no console do Windows). A ordem dos campos de cada conjunto de colunas (aba) é calculada uma
+    única vez, e os resultados são paginados: as primeiras linhas aparecem logo e as demais sob demanda.
+    """
+
+    # Colunas exibidas primeiro e com destaque.
+    COLUNAS_PRIORITARIAS = ('PRESTADOR', 'PROCEDIMENTOS', 'TUSS', 'AMB', 'CNPJ', 'RAZAO SOCIAL', 'ZONA/REGIÃO',
+                            'CD PESSOA')
+    _SEPARADOR_RESULTADO = f"{Colors.BOLD}{Colors.BATMAN_YELLOW}═══════════════════════════════════════════════════════{Colors.ENDC}\n"
+
+    def __init__(self, resultados_por_pagina=0):
+        self.resultados_por_pagina = resultados_por_pagina  # Linhas por página (0 = todas de uma vez).
+        self._ordens_campos = {}  # Colunas da aba -> campos exibidos, na ordem, com o prefixo já formatado.
+
+    def ordem_campos(self, colunas):
+        """
+        Retorna os campos exibidos para um conjunto de colunas: o setor de origem ('_ABA', na busca
+        global), as colunas prioritárias e as demais (sem as internas, de prefixo '_'). Cada campo
+        acompanha o prefixo formatado ('  NOME: '). O resultado é memorizado por conjunto de colunas.
+        """
+        chave = tuple(colunas)
+        campos = self._ordens_campos.get(chave)
+        if campos is None:
+            def prefixo(rotulo):
+                return f"  {Colors.GOTHAM_TEXT}{rotulo}:{Colors.ENDC} {Colors.BOLD}{Colors.BATMAN_YELLOW}"
+            # O setor é sempre exibido; os demais campos apenas quando preenchidos.
+            campos = [('_ABA', prefixo('SETOR'), True)] if '_ABA' in chave else []
+            campos += [(col, prefixo(str(col).upper()), False) for col in self.COLUNAS_PRIORITARIAS if col in chave]
+            campos += [(col, prefixo(str(col).upper()), False) for col in chave
+                       if not str(col).startswith('_') and col not in self.COLUNAS_PRIORITARIAS]
+            self._ordens_campos[chave] = campos
+        return campos
+
+    def formatar(self, df, inicio=1):
+        """Formata as linhas do DataFrame (numeradas a partir de 'inicio') e retorna o texto de cada uma."""
+        campos = self.ordem_campos(df.columns)
+        # Conversão para texto coluna a coluna (vetorizada), em vez de linha a linha.
+        valores = [(prefixo, sempre, df[col].astype(str).tolist()) for col, prefixo, sempre in campos]
+        blocos = []
+        for i in range(len(df)):
+            partes = [f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}═══════════════ [{inicio + i:03d}] RESULTADO "
+                      f"═══════════════{Colors.ENDC}\n"]
+            for prefixo, sempre, coluna in valores:
+                valor = coluna[i]
+                if sempre or valor.strip():
+                    partes.append(f"{prefixo}{valor}{Colors.ENDC}\n")
+            partes.append(self._SEPARADOR_RESULTADO)
+            blocos.append(''.join(partes))
+        return blocos
+
+    def exibir(self, grupos, cabecalho='', rodape=''):
+        """
+        Exibe grupos de resultados (título ou None, DataFrame), numerando as linhas de cada grupo a
+        partir de 1. Cada página é montada em memória e escrita de uma vez; entre as páginas, o
+        usuário escolhe continuar, exibir todas as restantes ou encerrar a exibição. Retorna o tempo
+        gasto na exibição, em segundos, sem a espera pelo operador entre as páginas.
+        """
+        inicio = time.perf_counter()
+        espera = 0.0  # Tempo aguardando o operador entre as páginas (não faz parte da exibição).
+        grupos = [(titulo, df) for titulo, df in grupos if not df.empty]
+        total = sum(len(df) for _, df in grupos)
+        pagina = [cabecalho]
+        exibidos = 0
+        limite = self.resultados_por_pagina or total
+        for titulo, df in grupos:
+            if titulo:
+                pagina.append(f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}----- {titulo} ({len(df)}) -----{Colors.ENDC}\n")
+            posicao = 0
+            while posicao < len(df):
+                quantidade = min(len(df) - posicao, limite - exibidos)
+                pagina.extend(self.formatar(df.iloc[posicao:posicao + quantidade], inicio=posicao + 1))
+                posicao += quantidade
+                exibidos += quantidade
+                if exibidos == limite and exibidos < total:
+                    self._escrever(pagina)
+                    pagina = []
+                    inicio_espera = time.perf_counter()
+                    resposta = self._perguntar_continuacao(total - exibidos)
+                    espera += time.perf_counter() - inicio_espera
+                    if resposta == 'V':
+                        self._escrever([rodape])
+                        return time.perf_counter() - inicio - espera
+                    limite = total if resposta == 'T' else limite + self.resultados_por_pagina
+        pagina.append(rodape)
+        self._escrever(pagina)
+        return time.perf_counter() - inicio - espera
+
+    def _perguntar_continuacao(self, restantes):
+        """Pergunta como seguir a exibição: 'T' (todos), 'V' (encerrar) ou '' (próxima página)."""
+        try:
+            resposta = input(
+                f"\n{Colors.GOTHAM_TEXT}{restantes} resultado(s) restante(s). ENTER para os próximos "
+                f"{min(restantes, self.resultados_por_pagina)}, 'T' para todos ou 'V' para encerrar: "
+                f"{Colors.BATMAN_YELLOW}").strip().upper()
+        except EOFError:
+            return 'V'
+        finally:
+            sys.stdout.write(Colors.ENDC)
+        return resposta if resposta in ('T', 'V') else ''
+
+    @staticmethod
+    def _escrever(partes):
+        """Escreve o texto acumulado em uma única operação de saída."""
+        sys.stdout.write(''.join(partes))
+        sys.stdout.flush()
+
+
 class MecanismoBuscaAvancado:
     """
     Gerencia o carregamento de dados a partir de um arquivo Excel e a busca
@@ -292,18 +1126,61 @@ class MecanismoBuscaAvancado:
     busca por relevância e similaridade (fuzzy).
     """
 
-    def __init__(self, nome_arquivo_excel):
-        """Inicializa o mecanismo de busca, carregando a configuração e os dados."""
+    # Versão do formato do snapshot: incrementar sempre que a preparação dos dados ou os índices mudarem.
+    _VERSAO_SNAPSHOT = 5
+    # Configurações que alteram os dados preparados e, portanto, fazem parte da chave do snapshot.
+    _CONFIG_SNAPSHOT = ['colunas_prioritarias', 'colunas_codigo', 'armazenamento_compacto']
+
+    def __init__(self, nome_arquivo_excel, config_extra=None):
+        """
+        Inicializa o mecanismo de busca, carregando a configuração e os dados. 'config_extra'
+        sobrepõe chaves da configuração (usado, por exemplo, pelos processos da busca global).
+        """
         self.nome_arquivo_excel = nome_arquivo_excel
-        self.dados_abas = {}  # Armazena os DataFrames de cada aba do Excel.
-        self.cache_busca = {}  # Cache para armazenar resultados de buscas recentes.
+        self.nomes_abas = []  # Nomes de todas as abas da planilha, na ordem original.
+        self.dados_abas = {}  # Armazena os DataFrames de cada aba do Excel (já preparados para busca).
+        self._arquivo_excel = None  # Planilha aberta no modo sob demanda, usada para ler cada aba.
+        self._chave_dados = None  # Chave do snapshot (planilha + configuração) dos dados carregados.
+        self._trava_carregamento = threading.RLock()  # Evita ler/preparar a mesma aba em duas threads.
+        self._normalizador = NormalizadorTexto()  # Normalização em lote, memorizada entre abas.
+        self.indices_abas = {}  # Índice invertido (IndiceInvertido) de cada aba, criado no carregamento.
+        self.indices_fuzzy = {}  # Índice de trigramas (IndiceFuzzy) de cada aba, usado na busca fuzzy.
+        self.indices_filtros = {}  # Listas de linhas por valor (IndiceFiltros) de cada aba, usadas nos filtros.
+        self.indices_codigos = {}  # Códigos TUSS/AMB/CNPJ (IndiceCodigos) de cada aba, para buscas por código.
+        self.textos_abas = {}  # Texto de busca compacto (TextoConsolidado) de cada aba, no modo compacto.
+        self.memoria_abas = {}  # Bytes do texto de busca de cada aba: (como coluna, como armazenado).
+        self.hashes_abas = {}  # Hash do conteúdo original de cada aba, usado para recarregar só as alteradas.
+        self._versoes_abas = {}  # Contador de publicações de cada aba (resultados de versões antigas não vão ao cache).
+        self._trava_publicacao = threading.Lock()  # Troca os dados e índices de uma aba de uma só vez.
+        self._assinatura_arquivo = None  # (data de modificação, tamanho) da planilha carregada.
         self.estatisticas = {  # Dicionário para monitorar a performance do sistema.
             'total_buscas': 0,
             'tempo_medio_busca': 0,
-            'resultados_encontrados': 0
+            'resultados_encontrados': 0,
+            'buscas_refinadas': 0,  # Buscas incrementais que reaproveitaram as linhas de uma busca anterior.
+            'buscas_globais': 0,  # Buscas feitas em todas as abas ao mesmo tempo.
+            'etapas_executadas': {'codigo': 0, 'exata': 0, 'relevancia': 0, 'fuzzy': 0}  # Etapas do planejador top-K.
         }
+        self._trava_estatisticas = threading.Lock()  # Buscas simultâneas (servidor) atualizam as estatísticas.
         self.config = self._carregar_configuracao()  # Carrega as configurações de busca.
+        self.config.update(config_extra or {})
+        # Temporizadores por etapa, percentis de latência por aba e exportação em JSON Lines.
+        self.metricas = MetricasDesempenho(self.config.get('arquivo_metricas'))
+        self._pool_processos = None  # Pool de processos da busca global, criado no primeiro uso.
+        # Exibição paginada e em lote dos resultados no terminal.
+        self.renderizador = RenderizadorResultados(self.config.get('resultados_por_pagina', 0))
+        # Buscas do terminal em segundo plano, canceláveis e com orçamento de tempo.
+        self.executor_buscas = ExecutorBuscas(self.config.get('orcamento_busca_segundos', 0))
+        # Cache LRU (com TTL e orçamento de memória opcionais) para resultados de buscas recentes.
+        self.cache_busca = CacheResultados(
+            self.config['tamanho_cache'],
+            max_bytes=int(self.config.get('limite_memoria_cache_mb', 0) * 1024 * 1024),
+            ttl_segundos=self.config.get('validade_cache_segundos', 0)
+        )
         self._carregar_dados()  # Inicia o carregamento do arquivo Excel.
+        if self.nomes_abas and self.config.get('intervalo_recarga_segundos'):
+            # Vigia a planilha em segundo plano e recarrega apenas as abas alteradas.
+            threading.Thread(target=self._vigiar_planilha, daemon=True).start()
 
     def _carregar_configuracao(self):
         """Carrega as configurações do arquivo 'config.json' ou usa as padrão (fallback)."""
@@ -312,9 +1189,28 @@ class MecanismoBuscaAvancado:
             'limiar_similaridade': 0.6,  # Limite para considerar uma busca fuzzy como relevante.
             'habilitar_cache': True,  # Flag para ativar/desativar o cache de busca.
             'tamanho_cache': 1000,  # Número máximo de entradas no cache.
+            'limite_memoria_cache_mb': 64,  # Orçamento de memória do cache, em MB (0 = sem limite).
+            'validade_cache_segundos': 0,  # Tempo de vida de cada entrada do cache, em segundos (0 = sem TTL).
             'habilitar_busca_fuzzy': True,  # Flag para ativar/desativar a busca por similaridade.
+            'habilitar_snapshot': True,  # Reutiliza os dados preparados salvos em disco entre execuções.
+            'somente_leitura_snapshot': False,  # Lê o snapshot sem nunca gravá-lo (usado pelos processos trabalhadores).
+            'carregamento_sob_demanda': True,  # Lê e prepara cada aba apenas quando ela é selecionada.
+            'aquecimento_em_segundo_plano': True,  # No modo sob demanda, prepara as demais abas em background.
+            'busca_global_processos': True,  # Busca global em processos (fuzzy usa CPU); False usa threads.
+            'trabalhadores_busca_global': 0,  # Número de trabalhadores da busca global (0 = núcleos da CPU).
+            'resultados_por_pagina': 20,  # Resultados exibidos por página no terminal (0 = todos de uma vez).
+            'arquivo_metricas': '',  # Grava cada medição de desempenho neste arquivo JSON Lines ('' = desativado).
+            'orcamento_busca_segundos': 3,  # Tempo máximo de uma busca no terminal; depois exibe o parcial (0 = sem limite).
+            'porta_servidor': 8765,  # Porta do servidor local (python mkacete.py --servidor), sempre em 127.0.0.1.
+            'trabalhadores_servidor': 4,  # Requisições do servidor local executadas ao mesmo tempo.
+            'trabalhadores_lote': 4,  # Consultas do processamento em lote (--lote) executadas ao mesmo tempo.
+            'lote_em_processos': True,  # Lote em processos (cada um carrega o snapshot); False usa threads.
+            'intervalo_recarga_segundos': 5,  # Intervalo de verificação de alterações na planilha (0 = desativado).
+            'armazenamento_compacto': True,  # Guarda o texto de busca de cada aba concatenado, sem uma string por linha.
             # Colunas usadas na busca e para exibir resultados.
             'colunas_prioritarias': ['PRESTADOR', 'PROCEDIMENTOS', 'TUSS', 'AMB'],
+            # Colunas de códigos indexadas para buscas por código (sem busca fuzzy).
+            'colunas_codigo': ['TUSS', 'AMB', 'CBHPM', 'CNPJ'],
             # Pesos para as colunas na busca por relevância (quanto maior, mais importante).
             'pesos_colunas': {
                 'PRESTADOR': 2.0,
@@ -344,227 +1240,941 @@ class MecanismoBuscaAvancado:
                 f"{Colors.BATMAN_YELLOW}ERRO: Arquivo '{self.nome_arquivo_excel}' não detectado. Verifique a matriz de dados.{Colors.ENDC}")
             return
         try:
-            inicio = time.time()
-            # Lê todas as abas do Excel em um dicionário de DataFrames.
-            self.dados_abas = pd.read_excel(
-                self.nome_arquivo_excel,
-                sheet_name=None,  # Lê todas as abas.
-                engine='openpyxl',
-                na_filter=False  # Não trata 'NA' como NaN.
-            )
-            self._preparar_dados_busca()  # Prepara os dados após o carregamento.
-            tempo_carregamento = time.time() - inicio
-            print(f"{Colors.BATMAN_YELLOW}✓ Banco de dados online em {tempo_carregamento:.2f}s!{Colors.ENDC}")
-            print(f"{Colors.GOTHAM_TEXT}Total de abas carregadas: {len(self.dados_abas)}{Colors.ENDC}")
+            inicio = time.perf_counter()
+            self._assinatura_arquivo = self._assinatura_planilha()
+            self._chave_dados = self._chave_snapshot()
+            # Reaproveita o snapshot em disco quando a planilha e a configuração não mudaram.
+            origem = 'snapshot'
+            if self._carregar_snapshot():
+                self.nomes_abas = list(self.dados_abas.keys())
+            elif self.config.get('carregamento_sob_demanda'):
+                origem = 'sob demanda'
+                # Lê apenas os nomes das abas (metadados); cada aba é lida na primeira seleção.
+                self._arquivo_excel = pd.ExcelFile(self.nome_arquivo_excel, engine='openpyxl')
+                self.nomes_abas = list(self._arquivo_excel.sheet_names)
+                if self.config.get('aquecimento_em_segundo_plano'):
+                    threading.Thread(target=self._aquecer_abas, daemon=True).start()
+            else:
+                origem = 'planilha'
+                # Lê todas as abas do Excel em um dicionário de DataFrames.
+                self.dados_abas = pd.read_excel(
+                    self.nome_arquivo_excel,
+                    sheet_name=None,  # Lê todas as abas.
+                    engine='openpyxl',
+                    na_filter=False  # Não trata 'NA' como NaN.
+                )
+                self.nomes_abas = list(self.dados_abas.keys())
+                self._preparar_dados_busca()  # Prepara os dados após o carregamento.
+                self._salvar_snapshot()
+            tempo_carregamento = time.perf_counter() - inicio
+            self.metricas.registrar('carregamento', tempo_carregamento, origem=origem)
+            print(f"{Colors.BATMAN_YELLOW}✓ Banco de dados online em {tempo_carregamento:.2f}s! ({origem}){Colors.ENDC}")
+            print(f"{Colors.GOTHAM_TEXT}Total de abas disponíveis: {len(self.nomes_abas)}{Colors.ENDC}")
         except Exception as e:
             # Captura e exibe erros críticos durante o carregamento.
             print(f"{Colors.BATMAN_YELLOW}Falha crítica ao carregar o arquivo: {e}{Colors.ENDC}")
 
+    def _caminho_snapshot(self):
+        """Retorna o caminho do arquivo de snapshot, ao lado da planilha."""
+        return f"{self.nome_arquivo_excel}.snapshot.pkl"
+
+    def _chave_snapshot(self):
+        """Monta a chave que identifica a planilha (caminho, tamanho, data e hash) e a configuração usada."""
+        info = os.stat(self.nome_arquivo_excel)
+        with open(self.nome_arquivo_excel, 'rb') as f:
+            hash_conteudo = hashlib.sha256(f.read()).hexdigest()
+        return {
+            'versao': self._VERSAO_SNAPSHOT,
+            'caminho': os.path.abspath(self.nome_arquivo_excel),
+            'tamanho': info.st_size,
+            'modificado': info.st_mtime_ns,
+            'hash': hash_conteudo,
+            'config': {chave: self.config.get(chave) for chave in self._CONFIG_SNAPSHOT},
+        }
+
+    def _carregar_snapshot(self):
+        """Carrega os dados preparados do snapshot se a chave gravada for igual à atual."""
+        if not self.config.get('habilitar_snapshot') or not os.path.exists(self._caminho_snapshot()):
+            return False
+        try:
+            with open(self._caminho_snapshot(), 'rb') as f:
+                # O cabeçalho (chave) é lido primeiro; os dados só são desserializados se ele bater.
+                if pickle.load(f) != self._chave_dados:
+                    return False
+                conteudo = pickle.load(f)
+            self.dados_abas = conteudo['dados_abas']
+            self.indices_abas = conteudo['indices_abas']
+            self.indices_fuzzy = conteudo['indices_fuzzy']
+            self.indices_filtros = conteudo['indices_filtros']
+            self.indices_codigos = conteudo['indices_codigos']
+            self.textos_abas = conteudo['textos_abas']
+            self.memoria_abas = conteudo['memoria_abas']
+            self.hashes_abas = conteudo['hashes_abas']
+            return True
+        except Exception as e:
+            # Snapshot corrompido ou incompatível: os dados são reconstruídos a partir da planilha.
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Snapshot ignorado ({e}). Recarregando a planilha...{Colors.ENDC}")
+            return False
+
+    def _salvar_snapshot(self):
+        """Grava os dados preparados e os índices em disco, precedidos do cabeçalho com a chave."""
+        if not self.config.get('habilitar_snapshot') or self.config.get('somente_leitura_snapshot'):
+            return
+        # Só o processo principal grava o snapshot (os trabalhadores o leem em modo somente leitura).
+        caminho_temporario = self._caminho_snapshot() + '.tmp'
+        try:
+            with open(caminho_temporario, 'wb') as f:
+                pickle.dump(self._chave_dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump({
+                    'dados_abas': self.dados_abas,
+                    'indices_abas': self.indices_abas,
+                    'indices_fuzzy': self.indices_fuzzy,
+                    'indices_filtros': self.indices_filtros,
+                    'indices_codigos': self.indices_codigos,
+                    'textos_abas': self.textos_abas,
+                    'memoria_abas': self.memoria_abas,
+                    'hashes_abas': self.hashes_abas,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Substituição atômica: outra instância nunca lê um snapshot pela metade.
+            os.replace(caminho_temporario, self._caminho_snapshot())
+        except Exception as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível salvar o snapshot: {e}{Colors.ENDC}")
+        finally:
+            # Após uma falha no meio da gravação, o arquivo temporário incompleto não fica no disco.
+            with contextlib.suppress(OSError):
+                os.remove(caminho_temporario)
+
+    def carregar_aba(self, nome_aba):
+        """
+        Retorna o DataFrame preparado da aba. No modo sob demanda, a aba é lida da planilha e
+        preparada na primeira chamada; as chamadas seguintes reutilizam o resultado.
+        """
+        df = self.dados_abas.get(nome_aba)
+        if df is not None or self._arquivo_excel is None or nome_aba not in self.nomes_abas:
+            return df
+        with self._trava_carregamento:
+            if nome_aba not in self.dados_abas:  # Outra thread pode ter preparado a aba enquanto esperávamos.
+                with self.metricas.medir('leitura', nome_aba):
+                    df = self._arquivo_excel.parse(nome_aba, na_filter=False)
+                self._preparar_aba(nome_aba, df)
+                # Com todas as abas prontas, a planilha é fechada e o snapshot completo é salvo.
+                if len(self.dados_abas) == len(self.nomes_abas):
+                    self._salvar_snapshot()
+                    self._arquivo_excel.close()
+                    self._arquivo_excel = None
+        return self.dados_abas.get(nome_aba)
+
+    def _aquecer_abas(self):
+        """Prepara, em segundo plano, as abas ainda não carregadas no modo sob demanda."""
+        for nome_aba in list(self.nomes_abas):
+            try:
+                self.carregar_aba(nome_aba)
+            except Exception:
+                # Falhas no aquecimento são ignoradas; a aba será tentada de novo ao ser selecionada.
+                continue
+
     def _preparar_dados_busca(self):
-        """Prepara os dados para busca, limpando, normalizando texto e criando uma coluna de busca consolidada."""
-        for nome_aba, df in self.dados_abas.items():
-            df_limpo = df.dropna(how='all')  # Remove linhas completamente vazias.
-            df_limpo = df_limpo.fillna('')  # Substitui valores NaN/vazios por string vazia.
-            for col in df_limpo.columns:
-                if df_limpo[col].dtype == 'object':
-                    # Normaliza o texto: minúsculas e remoção de acentos (unidecode).
-                    df_limpo[col] = df_limpo[col].astype(str).str.lower().apply(
-                        lambda x: unidecode(x) if x else ''
-                    )
-            # Cria uma coluna '_TEXTO_BUSCA' com o conteúdo de toda a linha para busca rápida.
-            df_limpo['_TEXTO_BUSCA'] = df_limpo.apply(
-                lambda row: ' '.join([str(val) for val in row.values if str(val).strip()]),
-                axis=1
-            )
+        """Prepara os dados de todas as abas carregadas para busca."""
+        for nome_aba, df in list(self.dados_abas.items()):
+            self._preparar_aba(nome_aba, df)
+
+    def _preparar_aba(self, nome_aba, df, hash_aba=None):
+        """
+        Prepara uma aba para busca, limpando, normalizando texto e criando uma coluna de busca consolidada.
+        'hash_aba' reaproveita o hash do conteúdo original já calculado (e.g., na recarga da planilha).
+        """
+        inicio = time.perf_counter()
+        if hash_aba is None:
+            hash_aba = self._hash_aba(df)  # Hash do conteúdo original, comparado nas recargas da planilha.
+        df_limpo = df.dropna(how='all')  # Remove linhas completamente vazias.
+        df_limpo = df_limpo.fillna('')  # Substitui valores NaN/vazios por string vazia.
+        df_limpo = df_limpo.reset_index(drop=True)  # O rótulo de cada linha passa a ser sua posição.
+        for col in df_limpo.columns:
+            if df_limpo[col].dtype == 'object' or isinstance(df_limpo[col].dtype, pd.StringDtype):
+                # Normaliza o texto: minúsculas e remoção de acentos (unidecode), uma vez por valor distinto.
+                df_limpo[col] = self._normalizador.normalizar_serie(df_limpo[col])
+        # Consolida o conteúdo de toda a linha em um texto de busca ('_TEXTO_BUSCA') para busca rápida.
+        serie_texto = NormalizadorTexto.texto_consolidado(df_limpo)
+        bytes_coluna = int(serie_texto.memory_usage(index=False, deep=True))
+        if self.config.get('armazenamento_compacto'):
+            # O texto fica fora do DataFrame, concatenado, e é gerado por linha apenas quando necessário.
+            texto = TextoConsolidado(serie_texto)
+            memoria = (bytes_coluna, texto.bytes)
+        else:
+            texto = None
+            df_limpo['_TEXTO_BUSCA'] = serie_texto
+            memoria = (bytes_coluna, bytes_coluna)
+        # Constrói o índice invertido da aba uma única vez, evitando varreduras completas por consulta.
+        indice = IndiceInvertido(serie_texto)
+        del serie_texto
+        indice_fuzzy = IndiceFuzzy(df_limpo, self.config['colunas_prioritarias'])
+        indice_filtros = IndiceFiltros(df_limpo)
+        colunas_codigo = {self._normalizar_termo(col) for col in self.config['colunas_codigo']}
+        indice_codigos = IndiceCodigos(
+            df_limpo, [col for col in df_limpo.columns if self._normalizar_termo(col) in colunas_codigo])
+        # A aba (dados e índices) é publicada de uma só vez, depois que tudo está pronto: buscas em
+        # andamento continuam com a versão anterior e as seguintes já usam a nova.
+        with self._trava_publicacao:
+            self.indices_abas[nome_aba] = indice
+            self.indices_fuzzy[nome_aba] = indice_fuzzy
+            self.indices_filtros[nome_aba] = indice_filtros
+            self.indices_codigos[nome_aba] = indice_codigos
+            self.textos_abas[nome_aba] = texto
+            self.memoria_abas[nome_aba] = memoria
+            self.hashes_abas[nome_aba] = hash_aba
+            self._versoes_abas[nome_aba] = self._versoes_abas.get(nome_aba, 0) + 1
             self.dados_abas[nome_aba] = df_limpo
-
-    def buscar_avancada(self, nome_aba, termo, filtros=None, max_resultados=None):
-        """Executa a busca por um termo em uma aba específica, usando algoritmos combinados (exata, relevância, fuzzy)."""
-        if not self.dados_abas or nome_aba not in self.dados_abas:
+        self.metricas.registrar('preparo', time.perf_counter() - inicio, nome_aba, linhas=len(df_limpo))
+
+    def _estruturas_aba(self, nome_aba):
+        """
+        Retorna, de forma consistente, o DataFrame, os índices (invertido, fuzzy, filtros e códigos),
+        o texto de busca compacto (None fora do modo compacto) e a versão de uma aba, mesmo que ela
+        esteja sendo trocada por uma recarga.
+        """
+        with self._trava_publicacao:
+            return (self.dados_abas.get(nome_aba), self.indices_abas.get(nome_aba),
+                    self.indices_fuzzy.get(nome_aba), self.indices_filtros.get(nome_aba),
+                    self.indices_codigos.get(nome_aba), self.textos_abas.get(nome_aba),
+                    self._versoes_abas.get(nome_aba, 0))
+
+    @staticmethod
+    def _hash_aba(df):
+        """Calcula o hash do conteúdo de uma aba (nomes das colunas e valores das células)."""
+        hash_conteudo = hashlib.sha256(repr(list(df.columns)).encode('utf-8'))
+        hash_conteudo.update(pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy().tobytes())
+        return hash_conteudo.hexdigest()
+
+    def _assinatura_planilha(self):
+        """Retorna a data de modificação e o tamanho da planilha, usados para detectar alterações."""
+        info = os.stat(self.nome_arquivo_excel)
+        return info.st_mtime_ns, info.st_size
+
+    def _vigiar_planilha(self):
+        """
+        Verifica periodicamente (polling da data de modificação) se a planilha mudou. A recarga só
+        começa quando a assinatura se repete em duas verificações, ou seja, a gravação terminou.
+        Uma versão que não pôde ser lida só é tentada de novo depois de outra alteração.
+        """
+        pendente = None
+        ignorada = None
+        while True:
+            time.sleep(self.config['intervalo_recarga_segundos'])
+            try:
+                assinatura = self._assinatura_planilha()
+            except OSError:
+                continue  # A planilha pode estar sendo substituída; tenta de novo na próxima verificação.
+            if assinatura in (self._assinatura_arquivo, ignorada):
+                pendente = None
+            elif assinatura != pendente:
+                pendente = assinatura  # Ainda em gravação (ou recém-alterada): espera estabilizar.
+            else:
+                alteradas = self.recarregar_alteracoes()
+                if alteradas is None:
+                    ignorada = assinatura
+                elif alteradas:
+                    print(f"\n{Colors.BATMAN_YELLOW}✓ Matriz de dados atualizada: "
+                          f"{len(alteradas)} setor(es) recarregado(s).{Colors.ENDC}")
+                pendente = None
+
+    def recarregar_alteracoes(self):
+        """
+        Relê a planilha e prepara novamente apenas as abas cujo conteúdo mudou (comparando o hash
+        de cada aba), além das abas novas. Abas removidas saem do sistema. Os dados são trocados
+        sem interromper as buscas, e o cache é invalidado só para as abas alteradas (e para as
+        buscas globais). Retorna os nomes das abas alteradas, novas ou removidas (None se a
+        planilha não pôde ser lida; nesse caso os dados atuais são mantidos).
+        """
+        with self._trava_carregamento:
+            try:
+                assinatura = self._assinatura_planilha()
+                chave = self._chave_snapshot()  # Calculada antes da leitura, como em '_carregar_dados'.
+                arquivo = pd.ExcelFile(self.nome_arquivo_excel, engine='openpyxl')
+            except Exception as e:
+                print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível reler a planilha: {e}{Colors.ENDC}")
+                return None
+            alteradas = []
+            try:
+                nomes = list(arquivo.sheet_names)
+                for nome_aba in nomes:
+                    # No modo sob demanda, abas ainda não carregadas serão lidas do arquivo novo.
+                    if nome_aba not in self.dados_abas and self._arquivo_excel is not None:
+                        continue
+                    df = arquivo.parse(nome_aba, na_filter=False)
+                    hash_aba = self._hash_aba(df)
+                    if self.hashes_abas.get(nome_aba) != hash_aba:
+                        self._preparar_aba(nome_aba, df, hash_aba)
+                        alteradas.append(nome_aba)
+            except Exception as e:
+                arquivo.close()
+                self._invalidar_abas(alteradas)  # Abas já trocadas antes da falha continuam atualizadas.
+                print(f"{Colors.BATMAN_YELLOW}Aviso: Recarga da planilha interrompida: {e}{Colors.ENDC}")
+                return None
+
+            removidas = [nome_aba for nome_aba in self.nomes_abas if nome_aba not in nomes]
+            with self._trava_publicacao:
+                for nome_aba in removidas:
+                    for estrutura in (self.dados_abas, self.indices_abas, self.indices_fuzzy, self.indices_filtros,
+                                      self.indices_codigos, self.textos_abas, self.memoria_abas,
+                                      self.hashes_abas):
+                        estrutura.pop(nome_aba, None)
+                self.nomes_abas[:] = nomes  # Mesma lista: os menus passam a mostrar as abas atuais.
+
+            # Substitui a planilha aberta do modo sob demanda pela versão nova.
+            if self._arquivo_excel is not None and len(self.dados_abas) < len(self.nomes_abas):
+                self._arquivo_excel.close()
+                self._arquivo_excel = arquivo
+            else:
+                arquivo.close()
+                if self._arquivo_excel is not None:
+                    self._arquivo_excel.close()
+                    self._arquivo_excel = None
+
+            self._assinatura_arquivo = assinatura
+            self._chave_dados = chave
+            alteradas += removidas
+            self._invalidar_abas(alteradas)
+            if len(self.dados_abas) == len(self.nomes_abas):
+                self._salvar_snapshot()
+            return alteradas
+
+    def _invalidar_abas(self, nomes_abas):
+        """Descarta do cache as buscas das abas informadas e encerra o pool da busca global."""
+        if not nomes_abas:
+            return
+        abas = set(nomes_abas)
+        # Buscas globais (aba None) combinam todas as abas e também são descartadas.
+        self.cache_busca.invalidar(lambda chave: chave[0] is None or chave[0] in abas)
+        self._encerrar_pool_processos()  # Os processos da busca global carregaram os dados antigos.
+
+    def _encerrar_pool_processos(self):
+        """Encerra o pool de processos da busca global; um novo pool é criado na próxima busca."""
+        if self._pool_processos is not None:
+            self._pool_processos.shutdown(wait=False)
+            self._pool_processos = None
+
+    def buscar_incremental(self, nome_aba, termo, filtros=None, max_resultados=None, cancelamento=None):
+        """
+        Busca incremental: quando o termo estende um termo já buscado na mesma aba e com os mesmos
+        filtros ("card" -> "cardio" -> "cardiologia"), as buscas exata e por relevância analisam apenas
+        as linhas que casaram com o termo anterior, guardadas no cache, em vez da aba inteira.
+        """
+        return self.buscar_avancada(nome_aba, termo, filtros, max_resultados, incremental=True,
+                                    cancelamento=cancelamento)
+
+    def buscar_avancada(self, nome_aba, termo, filtros=None, max_resultados=None, incremental=False,
+                        cancelamento=None):
+        """
+        Executa a busca por um termo em uma aba específica, usando algoritmos combinados (exata, relevância, fuzzy).
+        Com um token de cancelamento (CancelamentoBusca), a busca pode ser interrompida entre lotes
+        de linhas (BuscaCancelada) ou encerrada pelo orçamento de tempo, devolvendo os resultados
+        parciais ('resultado.attrs["parcial"]'), que não vão para o cache.
+        """
+        # No modo sob demanda, prepara a aba na primeira busca.
+        if self.carregar_aba(nome_aba) is None:
             return pd.DataFrame()  # Retorna DataFrame vazio se a aba não existir.
+        # Dados e índices da mesma versão da aba, mesmo se uma recarga a substituir durante a busca.
+        df_aba, indice, indice_fuzzy, indice_filtros, indice_codigos, texto, versao = self._estruturas_aba(nome_aba)
 
-        inicio = time.time()
-        df = self.dados_abas[nome_aba].copy()
+        inicio = time.perf_counter()
         max_resultados = max_resultados or self.config['max_resultados']
-        chave_cache = f"{nome_aba}_{termo}_{str(filtros)}_{max_resultados}"
+        chave_cache = self._chave_cache(nome_aba, termo, filtros)
 
-        # 1. Verifica o Cache
-        if self.config['habilitar_cache'] and chave_cache in self.cache_busca:
-            self.estatisticas['total_buscas'] += 1
-            return self.cache_busca[chave_cache]
-
-        # 2. Aplica Filtros (se houver)
-        if filtros:
-            df = self._aplicar_filtros(df, filtros)
+        # 1. Verifica o Cache (antes de qualquer cópia dos dados).
+        if self.config['habilitar_cache']:
+            resultados = self._consultar_cache(chave_cache, max_resultados)
+            if resultados is not None:
+                # Acertos também entram no tempo médio, mas com latência registrada à parte.
+                tempo_busca = time.perf_counter() - inicio
+                self._contabilizar_busca(tempo_busca)
+                self.metricas.registrar('busca_cache', tempo_busca, nome_aba, resultados=len(resultados))
+                return resultados
+
+        # Nenhuma etapa altera a aba: filtros e buscas criam novos DataFrames, então não há cópia completa.
+        df = df_aba
+
+        # 2. Aplica Filtros (se houver) e as cláusulas da consulta estruturada (campo:valor, "frase", -termo).
+        consulta = ConsultaEstruturada.interpretar(chave_cache[1])
+        if consulta.estruturada:
+            with self.metricas.medir('filtros', nome_aba):
+                df = self._aplicar_consulta(df, consulta, filtros, indice, indice_filtros, texto)
+        elif filtros:
+            with self.metricas.medir('filtros', nome_aba):
+                df = self._aplicar_filtros(df, filtros, indice_filtros)
+
+        # No modo incremental, reaproveita as linhas de uma busca anterior cujo termo é prefixo do atual.
+        linhas_base = None
+        if incremental and self.config['habilitar_cache'] and not consulta.estruturada:
+            linhas_base = self._linhas_busca_anterior(chave_cache)
+            if linhas_base is not None:
+                self._somar_estatistica('buscas_refinadas')
 
         # 3. Executa a Busca Multi-Algoritmo
-        resultados = self._busca_multi_algoritmo(df, termo, max_resultados)
-
-        # 4. Atualiza Estatísticas e Cache
-        tempo_busca = time.time() - inicio
-        self.estatisticas['total_buscas'] += 1
-        # Calcula o tempo médio de busca.
-        self.estatisticas['tempo_medio_busca'] = (
-                (self.estatisticas['tempo_medio_busca'] * (self.estatisticas['total_buscas'] - 1) + tempo_busca)
-                / self.estatisticas['total_buscas']
+        resultados, linhas_exatas = self._busca_multi_algoritmo(
+            df, consulta.termo, max_resultados, indice, indice_fuzzy, linhas_base, indice_codigos, texto,
+            cancelamento
         )
-        self.estatisticas['resultados_encontrados'] += len(resultados)
+        resultados.attrs['parcial'] = cancelamento is not None and cancelamento.esgotado
 
-        if self.config['habilitar_cache']:
-            # Gerencia o tamanho do cache, removendo o item mais antigo (FIFO) se estiver cheio.
-            if len(self.cache_busca) >= self.config['tamanho_cache']:
-                self.cache_busca.pop(next(iter(self.cache_busca)))
-            self.cache_busca[chave_cache] = resultados
+        # 4. Atualiza Estatísticas e Cache
+        tempo_busca = time.perf_counter() - inicio
+        self._contabilizar_busca(tempo_busca, len(resultados))
+        self.metricas.registrar('busca', tempo_busca, nome_aba, resultados=len(resultados),
+                                etapas=list(resultados.attrs.get('etapas', ())), parcial=resultados.attrs['parcial'])
+
+        # Resultados parciais, ou calculados sobre uma versão já substituída da aba, não vão para o cache.
+        if (self.config['habilitar_cache'] and not resultados.attrs['parcial']
+                and versao == self._versoes_abas.get(nome_aba, 0)):
+            # O cache remove as entradas menos usadas ao exceder o número de entradas ou a memória.
+            # As linhas da busca exata ficam guardadas para refinar buscas incrementais futuras
+            # (exceto em consultas estruturadas: uma cláusula mais longa pode incluir outras linhas).
+            if consulta.estruturada:
+                linhas_exatas = None
+            self.cache_busca.guardar(chave_cache, (resultados, max_resultados, linhas_exatas))
 
         return resultados
 
-    def _busca_multi_algoritmo(self, df, termo, max_resultados):
-        """Combina resultados de busca exata, por relevância e fuzzy para um resultado mais completo."""
-        termo_limpo = unidecode(termo).lower().strip()
-
-        # Executa os diferentes tipos de busca.
-        resultados_exatos = self._busca_exata(df, termo_limpo)
-        resultados_relevancia = self._busca_por_relevancia(df, termo_limpo, max_resultados)
-        resultados_fuzzy = self._busca_fuzzy(df, termo_limpo, max_resultados)
-
-        # Combina os DataFrames, remove duplicatas e limita ao máximo de resultados.
-        df_combinado = pd.concat([resultados_exatos, resultados_relevancia, resultados_fuzzy], axis=0)
-        df_resultado = df_combinado.drop_duplicates(keep='first').head(max_resultados)
-        return df_resultado
-
-    def _busca_exata(self, df, termo):
-        """Busca por correspondência exata do termo na coluna consolidada '_TEXTO_BUSCA'."""
-        mascara = df['_TEXTO_BUSCA'].str.contains(termo, na=False)
-        return df[mascara]
-
-    def _busca_por_relevancia(self, df, termo, max_resultados):
-        """Busca e pontua os resultados com base na relevância e posição do termo nas colunas prioritárias."""
-        resultados = []
-        for _, row in df.iterrows():
-            score = 0
-            # Pontuação baseada nos pesos definidos em 'pesos_colunas'.
-            for col, peso in self.config['pesos_colunas'].items():
-                if col in df.columns:
-                    if termo in str(row[col]):
-                        score += peso  # Pontuação base.
-                        if str(row[col]).startswith(termo):
-                            score += 0.5  # Bônus para termos no início da célula.
-                        if f' {termo} ' in f' {str(row[col])} ':
-                            score += 0.3  # Bônus para palavras inteiras (separadas por espaço).
-            if score > 0:
-                resultados.append((score, row))
-
-        # Ordena e retorna os resultados mais relevantes.
-        resultados.sort(key=lambda x: x[0], reverse=True)
-        return pd.DataFrame([row for _, row in resultados[:max_resultados]])
-
-    def _busca_fuzzy(self, df, termo, max_resultados):
-        """Busca por similaridade de escrita/fonética (fuzzy) usando SequenceMatcher."""
-        if not self.config['habilitar_busca_fuzzy']:
-            return pd.DataFrame()
+    def _contabilizar_busca(self, tempo_busca, resultados=0):
+        """
+        Conta uma busca (com ou sem acerto no cache), os resultados gerados e atualiza o tempo médio
+        de busca, tudo sob a trava das estatísticas.
+        """
+        with self._trava_estatisticas:
+            self.estatisticas['total_buscas'] += 1
+            self.estatisticas['tempo_medio_busca'] = (
+                    (self.estatisticas['tempo_medio_busca'] * (self.estatisticas['total_buscas'] - 1) + tempo_busca)
+                    / self.estatisticas['total_buscas']
+            )
+            self.estatisticas['resultados_encontrados'] += resultados
+
+    def _somar_estatistica(self, chave, quantidade=1):
+        """Soma um valor a um contador das estatísticas, sob a trava (buscas podem ser simultâneas)."""
+        with self._trava_estatisticas:
+            self.estatisticas[chave] += quantidade
+
+    def copiar_estatisticas(self):
+        """Retorna uma cópia consistente das estatísticas, tirada sob a trava."""
+        with self._trava_estatisticas:
+            return dict(self.estatisticas, etapas_executadas=dict(self.estatisticas['etapas_executadas']))
+
+    def buscar_global(self, termo, filtros=None, max_resultados=None, cancelamento=None):
+        """
+        Busca o termo em todas as abas em paralelo e combina os resultados em uma única lista
+        ordenada: primeiro as correspondências exatas (por pontuação de relevância), depois as
+        aproximadas (por similaridade). A coluna '_ABA' indica o setor de origem de cada linha.
+        Com um token de cancelamento, a busca pode ser cancelada ou devolver apenas as abas
+        concluídas dentro do orçamento de tempo.
+        """
+        inicio = time.perf_counter()
+        max_resultados = max_resultados or self.config['max_resultados']
+        chave_cache = self._chave_cache(None, termo, filtros)  # Aba None identifica a busca global.
+        if self.config['habilitar_cache']:
+            resultados = self._consultar_cache(chave_cache, max_resultados)
+            if resultados is not None:
+                self._somar_estatistica('buscas_globais')
+                self.metricas.registrar('busca_cache', time.perf_counter() - inicio, resultados=len(resultados))
+                return resultados
+
+        trabalhadores = self.config.get('trabalhadores_busca_global') or os.cpu_count() or 1
+        argumentos = [(nome_aba, termo, filtros, max_resultados) for nome_aba in self.nomes_abas]
+        partes = None
+        if self.config.get('busca_global_processos') and self.config['habilitar_busca_fuzzy']:
+            try:
+                if self._pool_processos is None:
+                    # Cada processo monta o próprio mecanismo uma única vez, com a configuração em uso.
+                    self._pool_processos = ProcessPoolExecutor(
+                        max_workers=trabalhadores, initializer=_iniciar_processo_busca,
+                        initargs=(self.nome_arquivo_excel, self.config))
+                futuros = [self._pool_processos.submit(_buscar_aba_em_processo, *args) for args in argumentos]
+                partes = self._aguardar_partes(futuros, cancelamento)
+            except BuscaCancelada:
+                raise
+            except Exception as e:
+                print(f"{Colors.BATMAN_YELLOW}Aviso: Busca global em processos indisponível ({e}). Usando threads.{Colors.ENDC}")
+                self.config['busca_global_processos'] = False
+                self._encerrar_pool_processos()
+        if partes is None:
+            with ThreadPoolExecutor(max_workers=trabalhadores) as pool:
+                futuros = [pool.submit(self._buscar_aba_pontuada, *args, cancelamento=cancelamento)
+                           for args in argumentos]
+                partes = self._aguardar_partes(futuros, cancelamento)
+
+        partes = [parte for parte in partes if not parte.empty]
+        with self.metricas.medir('combinacao'):
+            if partes:
+                # Abas têm colunas diferentes: colunas ausentes em uma aba ficam vazias.
+                combinado = pd.concat(partes, ignore_index=True, sort=False).fillna('')
+                combinado = combinado.sort_values(['_EXATO', '_PONTUACAO'], ascending=False, kind='stable')
+                resultados = combinado.head(max_resultados).drop(columns=['_EXATO'])
+                resultados = resultados[['_ABA'] + [col for col in resultados.columns if col != '_ABA']]
+            else:
+                resultados = pd.DataFrame()
+
+        self._somar_estatistica('buscas_globais')
+        resultados.attrs['parcial'] = cancelamento is not None and cancelamento.esgotado
+        self.metricas.registrar('busca_global', time.perf_counter() - inicio, resultados=len(resultados),
+                                parcial=resultados.attrs['parcial'])
+        if self.config['habilitar_cache'] and not resultados.attrs['parcial']:
+            self.cache_busca.guardar(chave_cache, (resultados, max_resultados, None))
+        return resultados
 
-        resultados = []
-        for _, row in df.iterrows():
-            melhor_similaridade = 0
-            # Calcula a similaridade (ratio) apenas nas colunas prioritárias.
-            for col in self.config['colunas_prioritarias']:
-                if col in df.columns and str(row[col]).strip():
-                    # SequenceMatcher calcula a similaridade entre o termo de busca e o conteúdo da célula.
-                    similaridade = SequenceMatcher(None, termo, str(row[col])).ratio()
-                    melhor_similaridade = max(melhor_similaridade, similaridade)
-
-            # Filtra resultados que atingem o limiar de similaridade.
-            if melhor_similaridade >= self.config['limiar_similaridade']:
-                resultados.append((melhor_similaridade, row))
-
-        # Ordena e retorna os resultados por maior similaridade.
-        resultados.sort(key=lambda x: x[0], reverse=True)
-        return pd.DataFrame([row for _, row in resultados[:max_resultados]])
-
-    def _aplicar_filtros(self, df, filtros):
-        """Aplica filtros adicionais aos resultados da busca usando correspondência de texto."""
-        df_filtrado = df.copy()
-        for coluna, valor in filtros.items():
-            if coluna in df_filtrado.columns and valor:
-                # Cria uma máscara para filtrar a coluna pelo valor.
-                mascara = df_filtrado[coluna].str.contains(str(valor), na=False)
-                df_filtrado = df_filtrado[mascara]
-        return df_filtrado
+    @staticmethod
+    def _aguardar_partes(futuros, cancelamento=None):
+        """
+        Aguarda os resultados de cada aba da busca global, na ordem das abas. Com um token de
+        cancelamento, a espera é feita em intervalos curtos: se a busca for cancelada, as abas
+        pendentes são descartadas (BuscaCancelada); se o orçamento de tempo acabar, apenas as abas
+        já concluídas entram no resultado.
+        """
+        if cancelamento is None:
+            return [futuro.result() for futuro in futuros]
+        pendentes = set(futuros)
+        try:
+            while pendentes and cancelamento.continuar():
+                _, pendentes = concurrent.futures.wait(pendentes, timeout=0.05)
+        finally:
+            for futuro in pendentes:
+                futuro.cancel()  # Abas ainda não iniciadas não chegam a ser executadas.
+        # Uma aba interrompida pelo prazo (ou cancelada) fica de fora do resultado.
+        return [futuro.result() for futuro in futuros
+                if futuro.done() and not futuro.cancelled() and futuro.exception() is None]
+
+    def _buscar_aba_pontuada(self, nome_aba, termo, filtros, max_resultados, cancelamento=None):
+        """
+        Executa a busca em uma aba e acrescenta as colunas usadas no ranking global: '_ABA',
+        '_EXATO' (o termo aparece no texto da linha) e '_PONTUACAO' (relevância para linhas exatas,
+        similaridade para as encontradas pela busca fuzzy).
+        """
+        resultados = self.buscar_avancada(nome_aba, termo, filtros, max_resultados, cancelamento=cancelamento)
+        if resultados.empty:
+            return resultados
+        termo_limpo = ConsultaEstruturada.interpretar(self._normalizar_termo(termo)).termo
+        exato = CorrespondenciaLiteral.do_termo(termo_limpo).mascara(resultados['_TEXTO_BUSCA'])
+        pontuacao = self._pontuar_relevancia(resultados, termo_limpo)
+        colunas = [col for col in self.config['colunas_prioritarias'] if col in resultados.columns]
+        for i in np.flatnonzero(~exato):
+            valores = [str(resultados.iat[i, resultados.columns.get_loc(col)]) for col in colunas]
+            pontuacao[i] = max((SequenceMatcher(None, termo_limpo, valor).ratio()
+                                for valor in valores if valor.strip()), default=0.0)
+        return resultados.assign(_ABA=nome_aba, _EXATO=exato, _PONTUACAO=pontuacao)
+
+    @staticmethod
+    def _normalizar_termo(termo):
+        """Normaliza o termo de busca (sem acentos, minúsculo e sem espaços nas bordas)."""
+        return unidecode(str(termo)).lower().strip()
+
+    def _chave_cache(self, nome_aba, termo, filtros):
+        """
+        Monta a chave canônica do cache: termo normalizado como na busca e filtros ordenados por
+        coluna, sem os vazios. Assim 'Cardiologia', 'cardiologia ' e 'CARDIOLOGIA' (ou filtros em
+        outra ordem) compartilham a mesma entrada. O número de resultados não faz parte da chave.
+        """
+        filtros_canonicos = tuple(sorted(
+            (str(coluna), self._normalizar_termo(valor)) for coluna, valor in (filtros or {}).items() if valor
+        ))
+        return nome_aba, self._normalizar_termo(termo), filtros_canonicos
+
+    def _consultar_cache(self, chave_cache, max_resultados):
+        """
+        Consulta o cache reaproveitando resultados de outros tamanhos: uma entrada com limite maior
+        (top-100) responde a um pedido menor (top-25) com suas primeiras linhas, e uma entrada que
+        ficou abaixo do próprio limite já contém todos os resultados e responde a qualquer tamanho.
+        """
+        def atende(entrada):
+            resultados, limite_guardado, _ = entrada
+            return limite_guardado >= max_resultados or len(resultados) < limite_guardado
+
+        entrada = self.cache_busca.obter(chave_cache, aceitar=atende)
+        if entrada is None:
+            return None
+        return entrada[0].head(max_resultados)
+
+    def _linhas_busca_anterior(self, chave_cache):
+        """
+        Procura no cache a busca anterior mais longa (mesma aba e filtros) cujo termo é prefixo do
+        termo atual e retorna as linhas que casaram com ela, ou None se não houver nenhuma.
+        """
+        nome_aba, termo_limpo, filtros_canonicos = chave_cache
+        if not CorrespondenciaLiteral.do_termo(termo_limpo).simples:
+            return None  # Com alternativas (OU), um termo mais longo pode casar com outras linhas.
+        for tamanho in range(len(termo_limpo) - 1, 0, -1):
+            prefixo = termo_limpo[:tamanho]
+            if prefixo != prefixo.strip():
+                continue  # Termos guardados no cache nunca têm espaços nas bordas.
+            entrada = self.cache_busca.espiar((nome_aba, prefixo, filtros_canonicos))
+            if entrada is not None and entrada[2] is not None:
+                # Toda linha que contém o termo atual também contém o prefixo.
+                return entrada[2]
+        return None
+
+    def _busca_multi_algoritmo(self, df, termo, max_resultados, indice=None, indice_fuzzy=None, linhas_base=None,
+                               indice_codigos=None, texto=None, cancelamento=None):
+        """
+        Combina resultados de busca exata, por relevância e fuzzy para um resultado mais completo.
+        Termos com formato de código (TUSS, AMB, CNPJ) são respondidos primeiro pelo índice de códigos
+        (códigos iguais e depois os que começam pelo termo); as vagas restantes são completadas pelas
+        buscas exata e por relevância (o termo no meio de outros textos), e nunca pela busca fuzzy. As etapas trabalham apenas com ids de linha (rótulos do DataFrame)
+        e pontuações; o DataFrame final é montado uma única vez com as linhas escolhidas. As etapas
+        executadas ficam em 'resultado.attrs["etapas"]'. Com um token de cancelamento, ele é verificado
+        entre as etapas e entre os lotes de linhas de cada uma; esgotado o orçamento de tempo, as etapas
+        restantes são puladas e o resultado contém o que já foi encontrado.
+        Retorna o DataFrame final e as linhas que casaram na busca exata (None se o termo tem
+        alternativas ou se a busca exata não foi necessária).
+        """
+        termo_limpo = self._normalizar_termo(termo)
+        codigo = IndiceCodigos.normalizar_codigo(termo_limpo)
+
+        # Planejador top-K: as etapas rodam da mais barata para a mais cara (código, exata, relevância,
+        # fuzzy) e cada etapa só busca as linhas que ainda faltam. Quando os resultados já estão
+        # garantidos, as etapas seguintes são puladas; a ordem final é a mesma da execução completa.
+        etapas = []
+        ids_finais = np.empty(0, dtype=np.int64)
+        ids_exatos = None
+
+        def continuar():
+            return cancelamento is None or cancelamento.continuar()
+
+        if codigo is not None and indice_codigos is not None and indice_codigos.colunas:
+            etapas.append('codigo')
+            with self.metricas.medir('codigo'):
+                ids_finais = indice_codigos.linhas(codigo)
+                if len(df) != indice_codigos.total_linhas:
+                    ids_finais = ids_finais[np.isin(ids_finais, df.index.to_numpy())]  # Respeita os filtros.
+                ids_finais = ids_finais[:max_resultados]
+
+        # Os códigos encontrados vêm primeiro; as vagas restantes (ou todas, sem acertos) vêm da busca como texto.
+        if len(ids_finais) < max_resultados and continuar():
+            # Restringe as buscas exata e por relevância às linhas de uma busca anterior (modo incremental)
+            # ou às linhas candidatas do índice invertido (None = todas as linhas do DataFrame).
+            etapas.append('exata')
+            with self.metricas.medir('exata'):
+                if linhas_base is not None:
+                    linhas_candidatas = linhas_base
+                else:
+                    linhas_candidatas = self._linhas_candidatas(df, termo_limpo, indice)
+                ids_exatos, _ = self._busca_exata(df, termo_limpo, linhas_candidatas, texto, cancelamento)
+                novos = ids_exatos[~np.isin(ids_exatos, ids_finais)] if len(ids_finais) else ids_exatos
+                ids_finais = np.concatenate([ids_finais, novos[:max_resultados - len(ids_finais)]])
+
+            if len(ids_finais) < max_resultados and continuar():
+                etapas.append('relevancia')
+                with self.metricas.medir('relevancia'):
+                    ids_relevancia, _ = self._busca_por_relevancia(
+                        df, termo_limpo, max_resultados - len(ids_finais), linhas_candidatas, excluir=ids_finais,
+                        cancelamento=cancelamento)
+                ids_finais = np.concatenate([ids_finais, ids_relevancia])
+
+        # Similaridade de escrita não faz sentido para códigos numéricos.
+        if (len(ids_finais) < max_resultados and codigo is None and self.config['habilitar_busca_fuzzy']
+                and indice_fuzzy is not None and continuar()):
+            etapas.append('fuzzy')
+            with self.metricas.medir('fuzzy'):
+                ids_fuzzy, _ = self._busca_fuzzy(
+                    df, termo_limpo, max_resultados - len(ids_finais), indice_fuzzy, excluir=ids_finais,
+                    cancelamento=cancelamento)
+            ids_finais = np.concatenate([ids_finais, ids_fuzzy])
+
+        with self._trava_estatisticas:
+            for etapa in etapas:
+                self.estatisticas['etapas_executadas'][etapa] += 1
+
+        # Materializa apenas as linhas finais; as etapas executadas ficam registradas no resultado.
+        with self.metricas.medir('montagem'):
+            df_resultado = df.loc[ids_finais]
+            if texto is not None:
+                # No modo compacto, o texto de busca é gerado só para as linhas do resultado.
+                df_resultado = df_resultado.assign(_TEXTO_BUSCA=texto.serie(ids_finais))
+        df_resultado.attrs['etapas'] = tuple(etapas)
+        if (ids_exatos is None or not CorrespondenciaLiteral.do_termo(termo_limpo).simples
+                or (cancelamento is not None and cancelamento.esgotado)):
+            return df_resultado, None
+        return df_resultado, ids_exatos
+
+    def _linhas_candidatas(self, df, termo, indice):
+        """
+        Retorna os ids das linhas que o índice invertido aponta como possíveis correspondências,
+        ou None quando todas as linhas do DataFrame precisam ser analisadas.
+        """
+        if indice is None:
+            return None
+        motor = CorrespondenciaLiteral.do_termo(termo)
+        candidatos = None
+        # Trechos obrigatórios (E) intersectam os candidatos; alternativos (OU) os unem.
+        for trecho in motor.obrigatorios:
+            linhas = indice.candidatos(trecho)
+            if linhas is not None:
+                candidatos = linhas if candidatos is None else np.intersect1d(candidatos, linhas, assume_unique=True)
+        if motor.alternativos and candidatos is None:
+            uniao = [indice.candidatos(trecho) for trecho in motor.alternativos]
+            if all(linhas is not None for linhas in uniao):
+                candidatos = np.unique(np.concatenate(uniao))
+        if candidatos is None or len(df) == indice.total_linhas:
+            return candidatos
+        # Respeita os filtros já aplicados ao DataFrame, mantendo a ordem original das linhas.
+        return candidatos[np.isin(candidatos, df.index.to_numpy())]
+
+    @staticmethod
+    def _selecionar_linhas(serie, linhas):
+        """Retorna a coluna inteira ou apenas as linhas (ids) informadas."""
+        return serie if linhas is None else serie.loc[linhas]
+
+    def _textos_busca(self, df, texto, linhas=None):
+        """
+        Retorna o '_TEXTO_BUSCA' das linhas (ids) informadas, ou de todas as linhas do DataFrame:
+        da coluna do DataFrame ou, no modo compacto, gerado a partir do texto concatenado da aba.
+        """
+        if texto is None:
+            return self._selecionar_linhas(df['_TEXTO_BUSCA'], linhas)
+        if linhas is None and len(df) != len(texto):
+            linhas = df.index.to_numpy()  # DataFrame já filtrado: apenas as suas linhas.
+        return texto.serie(linhas)
+
+    def _busca_exata(self, df, termo, linhas=None, texto=None, cancelamento=None):
+        """
+        Busca por correspondência literal do termo no texto consolidado ('_TEXTO_BUSCA') das linhas.
+        Retorna os ids das linhas encontradas (na ordem original) e suas pontuações (1.0).
+        """
+        textos = self._textos_busca(df, texto, linhas)
+        motor = CorrespondenciaLiteral.do_termo(termo)
+        if cancelamento is None:
+            mascara = motor.mascara(textos)
+        else:
+            # Verificação em lotes: linhas de lotes não processados (prazo esgotado) ficam de fora.
+            mascara = np.zeros(len(textos), dtype=bool)
+            for inicio, fim in cancelamento.lotes(len(textos)):
+                mascara[inicio:fim] = motor.mascara(textos.iloc[inicio:fim])
+        ids = textos.index.to_numpy()[mascara]
+        return ids, np.ones(len(ids), dtype=np.float64)
+
+    def _busca_por_relevancia(self, df, termo, max_resultados, linhas=None, excluir=None, cancelamento=None):
+        """
+        Busca e pontua os resultados com base na relevância e posição do termo nas colunas prioritárias.
+        Retorna os ids das linhas mais relevantes (ignorando os ids em 'excluir') e suas pontuações,
+        em ordem decrescente.
+        """
+        scores = self._pontuar_relevancia(df, termo, linhas, cancelamento)
+        ids = df.index.to_numpy() if linhas is None else np.asarray(linhas, dtype=np.int64)
+        if excluir is not None and len(excluir):
+            scores[np.isin(ids, excluir)] = 0.0
+        posicoes, valores = self._selecionar_top_k(scores, max_resultados)
+        return ids[posicoes], valores
+
+    def _pontuar_relevancia(self, df, termo, linhas=None, cancelamento=None):
+        """
+        Calcula o vetor de pontuação de relevância das linhas, processando uma coluna por vez
+        (o token de cancelamento, se houver, é verificado antes de cada coluna).
+        """
+        scores = np.zeros(len(df) if linhas is None else len(linhas), dtype=np.float64)
+        # Pontuação baseada nos pesos definidos em 'pesos_colunas'.
+        for col, peso in self.config['pesos_colunas'].items():
+            if col not in df.columns:
+                continue
+            if cancelamento is not None and not cancelamento.continuar():
+                break
+            textos = self._selecionar_linhas(df[col], linhas).astype(str)
+            contem = textos.str.contains(termo, regex=False).to_numpy(dtype=bool)
+            if not contem.any():
+                continue
+            # Bônus para termos no início da célula.
+            comeca = contem & textos.str.startswith(termo).to_numpy(dtype=bool)
+            # Bônus para palavras inteiras (separadas por espaço).
+            palavra = contem & (' ' + textos + ' ').str.contains(f' {termo} ', regex=False).to_numpy(dtype=bool)
+            # Soma na mesma ordem da pontuação linha a linha (base, início, palavra) para manter os mesmos valores.
+            scores += np.where(contem, peso, 0.0)
+            scores += np.where(comeca, 0.5, 0.0)
+            scores += np.where(palavra, 0.3, 0.0)
+        return scores
+
+    @staticmethod
+    def _selecionar_top_k(scores, k):
+        """
+        Seleciona as k posições de maior pontuação (> 0) com 'argpartition', ordenadas por pontuação
+        decrescente. Empates mantêm a ordem original das linhas, como na ordenação estável.
+        """
+        posicoes = np.flatnonzero(scores > 0)
+        valores = scores[posicoes]
+        if len(posicoes) > k:
+            # Valor da k-ésima maior pontuação: tudo acima dele entra; empates entram pela ordem das linhas.
+            limite = valores[np.argpartition(-valores, k - 1)[k - 1]]
+            acima = np.flatnonzero(valores > limite)
+            empates = np.flatnonzero(valores == limite)[:k - len(acima)]
+            selecionadas = np.sort(np.concatenate([acima, empates]))
+            posicoes, valores = posicoes[selecionadas], valores[selecionadas]
+        ordem = np.argsort(-valores, kind='stable')
+        return posicoes[ordem], valores[ordem]
+
+    def _busca_fuzzy(self, df, termo, max_resultados, indice_fuzzy=None, excluir=None, cancelamento=None):
+        """
+        Busca por similaridade de escrita/fonética (fuzzy) usando o índice de trigramas e SequenceMatcher.
+        Retorna os ids das linhas mais similares (ignorando os ids em 'excluir') e suas similaridades,
+        em ordem decrescente.
+        """
+        if not self.config['habilitar_busca_fuzzy'] or indice_fuzzy is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        # Melhor similaridade de cada linha da aba, restrita às linhas presentes no DataFrame (filtros).
+        ids = df.index.to_numpy()
+        melhores = indice_fuzzy.similaridades(termo, self.config['limiar_similaridade'], cancelamento)[ids]
+        if excluir is not None and len(excluir):
+            melhores[np.isin(ids, excluir)] = 0.0
+
+        # Ordena os resultados que atingem o limiar pela maior similaridade.
+        posicoes, valores = self._selecionar_top_k(melhores, max_resultados)
+        return ids[posicoes], valores
+
+    def _aplicar_filtros(self, df, filtros, indice_filtros=None):
+        """
+        Aplica filtros adicionais aos resultados da busca usando correspondência literal de texto
+        ('|' separa alternativas). 'filtros' é um dicionário coluna -> valor ou uma lista de pares
+        (coluna, valor), que permite mais de um filtro na mesma coluna. Colunas indexadas em
+        'indice_filtros' são resolvidas pelas listas de linhas de cada valor; as demais só verificam
+        as linhas que passaram pelos filtros anteriores. Apenas as linhas resultantes são copiadas.
+        """
+        itens = filtros.items() if isinstance(filtros, dict) else filtros
+        motores = [
+            (coluna, CorrespondenciaLiteral.do_termo(self._normalizar_termo(valor)))
+            for coluna, valor in itens if coluna in df.columns and valor
+        ]
+        if indice_filtros is not None and len(df) != indice_filtros.total_linhas:
+            indice_filtros = None  # O índice descreve a aba inteira, não um subconjunto dela.
+        linhas = None  # None = todas as linhas do DataFrame.
+        restantes = []
+        for coluna, motor in motores:
+            linhas_coluna = indice_filtros.linhas(coluna, motor) if indice_filtros is not None else None
+            if linhas_coluna is None:
+                restantes.append((coluna, motor))
+            elif linhas is None:
+                linhas = linhas_coluna
+            else:
+                linhas = np.intersect1d(linhas, linhas_coluna, assume_unique=True)
+
+        for coluna, motor in restantes:
+            # Cria uma máscara para filtrar a coluna pelo valor (normalizado como os dados da aba);
+            # colunas numéricas (e.g., TUSS lida como inteiro) são comparadas como texto.
+            textos = self._selecionar_linhas(df[coluna], linhas).astype(str)
+            linhas = textos.index.to_numpy()[motor.mascara(textos)]
+        return df if linhas is None else df.loc[linhas]
+
+    def _aplicar_consulta(self, df, consulta, filtros, indice=None, indice_filtros=None, texto=None):
+        """
+        Restringe o DataFrame às linhas que atendem a todas as cláusulas da consulta estruturada,
+        avaliadas da mais barata para a mais cara: filtros por coluna (listas de linhas por valor),
+        candidatos das frases no índice invertido, confirmação literal das frases (da mais longa
+        para a mais curta) e, por último, as exclusões, verificadas só nas linhas que ainda restam.
+        """
+        filtros_coluna = list((filtros or {}).items())
+        exclusoes_coluna = []
+        frases = list(consulta.frases)
+        exclusoes = list(consulta.exclusoes)
+        for campo, valor, excluir in consulta.campos:
+            coluna = self._resolver_coluna(df, campo)
+            if coluna is None:
+                # A aba não possui o campo: o valor precisa (ou não pode) aparecer em qualquer parte da linha.
+                (exclusoes if excluir else frases).append(valor)
+            else:
+                (exclusoes_coluna if excluir else filtros_coluna).append((coluna, valor))
+
+        # 1. Filtros por coluna, resolvidos pelas listas de linhas de cada valor.
+        if filtros_coluna:
+            df = self._aplicar_filtros(df, filtros_coluna, indice_filtros)
+
+        # 2. Frases: candidatos do índice invertido e confirmação literal, da mais longa para a mais curta.
+        linhas = None if indice is None or len(df) == indice.total_linhas else df.index.to_numpy()
+        for frase in sorted(frases, key=len, reverse=True):
+            candidatos = self._linhas_candidatas(df, frase, indice)
+            if candidatos is not None:
+                linhas = candidatos if linhas is None else np.intersect1d(linhas, candidatos, assume_unique=True)
+            textos = self._textos_busca(df, texto, linhas)
+            linhas = textos.index.to_numpy()[CorrespondenciaLiteral.do_termo(frase).mascara(textos)]
+
+        # 3. Exclusões: só as linhas restantes que podem conter o trecho são verificadas.
+        for coluna, valor in exclusoes_coluna + [(None, valor) for valor in exclusoes]:
+            # Coluna None: o trecho não pode aparecer em nenhuma parte da linha.
+            if coluna is None:
+                textos = self._textos_busca(df, texto, linhas)
+            else:
+                textos = self._selecionar_linhas(df[coluna], linhas).astype(str)
+            motor = CorrespondenciaLiteral.do_termo(self._normalizar_termo(valor))
+            linhas = textos.index.to_numpy()[~motor.mascara(textos)]
+
+        return df if linhas is None else df.loc[linhas]
+
+    def _resolver_coluna(self, df, campo):
+        """
+        Encontra a coluna correspondente ao campo de uma consulta estruturada, comparando nomes
+        normalizados ('_' equivale a espaço): primeiro o nome igual, depois um único nome que
+        comece pelo campo. Retorna None se a aba não possuir a coluna.
+        """
+        campo = campo.replace('_', ' ')
+        nomes = {
+            col: self._normalizar_termo(col) for col in df.columns if not str(col).startswith('_')
+        }
+        iguais = [col for col, nome in nomes.items() if nome == campo]
+        if iguais:
+            return iguais[0]
+        parciais = [col for col, nome in nomes.items() if nome.startswith(campo)]
+        return parciais[0] if len(parciais) == 1 else None
+
+    # Temas dos setores de infiltração/medicação: as palavras-chave de cada tema formam um único
+    # motor literal (alternativas compiladas uma só vez).
+    _TEMAS_RESULTADOS = (
+        ("INFILTRAÇÃO / BLOQUEIO", CorrespondenciaLiteral(alternativos=['infiltracao', 'infiltração', 'bloqueio'])),
+        ("RETIRADA DE MEDICAMENTO", CorrespondenciaLiteral(alternativos=['retirada', 'remocao', 'remover'])),
+    )
 
     def exibir_resultados_avancados(self, resultados, termo, nome_aba, tempo_busca=None):
-        """Exibe os resultados da busca de forma estilizada no terminal (Tema Batman)."""
+        """Exibe os resultados da busca de forma estilizada no terminal (Tema Batman), paginados."""
         if resultados.empty:
             print(
                 f"\n{Colors.BATMAN_YELLOW}Nenhum resultado encontrado para '{termo}' no setor '{nome_aba}'.{Colors.ENDC}")
+            if resultados.attrs.get('parcial'):
+                print(f"{Colors.BATMAN_YELLOW}⚠ A busca foi interrompida: o tempo máximo se esgotou.{Colors.ENDC}")
             return
 
-        # Exibe o cabeçalho do relatório de busca.
-        print(f"\n{Colors.BATMAN_YELLOW}>>> Resultado da Busca Subterrânea <<<{Colors.ENDC}")
-        print(f"{Colors.GOTHAM_TEXT}┌─ Termo de busca: {Colors.BOLD}{Colors.BATMAN_YELLOW}{termo}{Colors.ENDC}")
-        print(f"{Colors.GOTHAM_TEXT}├─ Setor de dados: {Colors.BOLD}{Colors.BATMAN_YELLOW}{nome_aba}{Colors.ENDC}")
-        print(
-            f"{Colors.GOTHAM_TEXT}├─ Total de resultados: {Colors.BOLD}{Colors.BATMAN_YELLOW}{len(resultados)}{Colors.ENDC}")
+        # Cabeçalho do relatório de busca, escrito junto com a primeira página.
+        cabecalho = [
+            f"\n{Colors.BATMAN_YELLOW}>>> Resultado da Busca Subterrânea <<<{Colors.ENDC}",
+            f"{Colors.GOTHAM_TEXT}┌─ Termo de busca: {Colors.BOLD}{Colors.BATMAN_YELLOW}{termo}{Colors.ENDC}",
+            f"{Colors.GOTHAM_TEXT}├─ Setor de dados: {Colors.BOLD}{Colors.BATMAN_YELLOW}{nome_aba}{Colors.ENDC}",
+            f"{Colors.GOTHAM_TEXT}├─ Total de resultados: {Colors.BOLD}{Colors.BATMAN_YELLOW}{len(resultados)}{Colors.ENDC}",
+        ]
         if tempo_busca:
-            print(
+            cabecalho.append(
                 f"{Colors.GOTHAM_TEXT}└─ Tempo de execução: {Colors.BOLD}{Colors.BATMAN_YELLOW}{tempo_busca:.3f}s{Colors.ENDC}")
-        print(f"{Colors.GOTHAM_TEXT}-----------------------------------------{Colors.ENDC}")
+        if resultados.attrs.get('parcial'):
+            cabecalho.append(
+                f"{Colors.BATMAN_YELLOW}⚠ Resultados parciais: o tempo máximo da busca se esgotou.{Colors.ENDC}")
+        cabecalho.append(f"{Colors.GOTHAM_TEXT}-----------------------------------------{Colors.ENDC}")
 
-        # Escolhe o método de exibição baseado no nome da aba.
+        # Escolhe o agrupamento baseado no nome da aba.
         if 'infiltracao' in nome_aba.lower() or 'medicacao' in nome_aba.lower():
-            self._exibir_resultados_por_tema(resultados)
+            grupos = self._agrupar_resultados_por_tema(resultados)
         else:
-            self._exibir_generico_futurista(resultados)
-
-        print(f"\n{Colors.GOTHAM_TEXT}-----------------------------------------{Colors.ENDC}")
-
-    def _exibir_resultados_por_tema(self, resultados):
-        """Agrupa e exibe resultados por categorias específicas (e.g., Infiltração/Bloqueio)."""
-        temas = {
-            "INFILTRAÇÃO / BLOQUEIO": ['infiltracao', 'infiltração', 'bloqueio'],
-            "RETIRADA DE MEDICAMENTO": ['retirada', 'remocao', 'remover'],
-        }
-        df_restantes = resultados.copy()
-        for titulo_tema, palavras_chave in temas.items():
-            # Cria máscara para filtrar por palavras-chave no texto consolidado.
-            mask = df_restantes['_TEXTO_BUSCA'].str.contains('|'.join(palavras_chave), na=False)
-            df_tema = df_restantes[mask]
-            if not df_tema.empty:
-                self._exibir_bloco_categoria(titulo_tema, df_tema)
-            # Atualiza o DataFrame restante, excluindo os resultados já exibidos.
-            df_restantes = df_restantes[~mask]
-
-        if not df_restantes.empty:
-            self._exibir_bloco_categoria("Outros Resultados (Sem Categoria)", df_restantes)
-
-    def _exibir_bloco_categoria(self, titulo, df):
-        """Função auxiliar para exibir blocos de resultados temáticos com título."""
-        if not df.empty:
-            print(f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}----- {titulo} ({len(df)}) -----{Colors.ENDC}")
-            self._exibir_generico_futurista(df)
-
-    def _exibir_generico_futurista(self, df):
-        """Formata e exibe os resultados da busca de forma genérica e estilizada por linha."""
-        for i, (_, row) in enumerate(df.iterrows(), 1):
-            print(
-                f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}═══════════════ [{i:03d}] RESULTADO ═══════════════{Colors.ENDC}")
-            key_color = Colors.GOTHAM_TEXT
-            value_color = Colors.BOLD + Colors.BATMAN_YELLOW
-            # Colunas a serem exibidas primeiro e com destaque (configuráveis).
-            colunas_prioritarias = ['PRESTADOR', 'PROCEDIMENTOS', 'TUSS', 'AMB', 'CNPJ', 'RAZAO SOCIAL', 'ZONA/REGIÃO',
-                                    'CD PESSOA']
-
-            # Exibe colunas prioritárias.
-            for col in colunas_prioritarias:
-                if col in row.index and str(row[col]).strip():
-                    print(f"  {key_color}{str(col).upper()}:{Colors.ENDC} {value_color}{row[col]}{Colors.ENDC}")
-
-            # Exibe outras colunas não prioritárias (para dados adicionais).
-            for col, val in row.items():
-                if str(val).strip() and col != '_TEXTO_BUSCA' and col not in colunas_prioritarias:
-                    print(f"  {key_color}{str(col).upper()}:{Colors.ENDC} {value_color}{val}{Colors.ENDC}")
-
-            print(
-                f"{Colors.BOLD}{Colors.BATMAN_YELLOW}═══════════════════════════════════════════════════════{Colors.ENDC}")
+            grupos = [(None, resultados)]
+
+        tempo_exibicao = self.renderizador.exibir(
+            grupos, cabecalho='\n'.join(cabecalho) + '\n',
+            rodape=f"\n{Colors.GOTHAM_TEXT}-----------------------------------------{Colors.ENDC}\n")
+        self.metricas.registrar('exibicao', tempo_exibicao, nome_aba, resultados=len(resultados))
+
+    def _agrupar_resultados_por_tema(self, resultados):
+        """
+        Separa os resultados por categorias específicas (e.g., Infiltração/Bloqueio): cada linha vai
+        para o primeiro tema cujas palavras-chave aparecem no texto consolidado, e as demais para
+        'Outros Resultados'. Retorna a lista de grupos (título, DataFrame) na ordem de exibição.
+        """
+        textos = resultados['_TEXTO_BUSCA']
+        restantes = np.ones(len(resultados), dtype=bool)
+        grupos = []
+        for titulo_tema, motor in self._TEMAS_RESULTADOS:
+            mascara = restantes.copy()
+            if restantes.any():
+                # Só as linhas ainda sem tema são verificadas.
+                mascara[restantes] = motor.mascara(textos[restantes])
+            grupos.append((titulo_tema, resultados[mascara]))
+            restantes &= ~mascara
+        grupos.append(("Outros Resultados (Sem Categoria)", resultados[restantes]))
+        return grupos
 
     def mostrar_estatisticas(self):
         """Exibe as estatísticas de uso e performance do sistema (Relatório de Status)."""
@@ -575,14 +2185,79 @@ class MecanismoBuscaAvancado:
             f"{Colors.GOTHAM_TEXT}Tempo médio de resposta: {Colors.BOLD}{self.estatisticas['tempo_medio_busca']:.3f}s{Colors.ENDC}")
         print(
             f"{Colors.GOTHAM_TEXT}Total de resultados gerados: {Colors.BOLD}{self.estatisticas['resultados_encontrados']}{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Buscas incrementais refinadas: {Colors.BOLD}{self.estatisticas['buscas_refinadas']}{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Buscas canceladas/parciais: {Colors.BOLD}{self.executor_buscas.canceladas}/"
+            f"{self.executor_buscas.parciais}{Colors.ENDC}")
+        etapas = self.estatisticas['etapas_executadas']
+        print(
+            f"{Colors.GOTHAM_TEXT}Etapas executadas (código/exata/relevância/fuzzy): {Colors.BOLD}{etapas['codigo']}/"
+            f"{etapas['exata']}/{etapas['relevancia']}/{etapas['fuzzy']}{Colors.ENDC}")
         print(f"{Colors.GOTHAM_TEXT}Cache de memória: {Colors.BOLD}{len(self.cache_busca)}{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Memória do cache: {Colors.BOLD}{self.cache_busca.bytes_usados / (1024 * 1024):.2f} MB{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Cache (acertos/falhas/remoções/expirados): {Colors.BOLD}{self.cache_busca.acertos}/"
+            f"{self.cache_busca.falhas}/{self.cache_busca.remocoes}/{self.cache_busca.expiracoes}{Colors.ENDC}")
+        self._mostrar_memoria_abas()
+        self._mostrar_latencias()
         print(
             f"{Colors.GOTHAM_TEXT}Status do cache: {Colors.BOLD}{'Ativo' if self.config['habilitar_cache'] else 'Inativo'}{Colors.ENDC}")
         print(f"{Colors.BATMAN_YELLOW}-----------------------------------------{Colors.ENDC}")
 
+    def _mostrar_latencias(self):
+        """Exibe a latência de cada etapa e, por setor, das buscas sem e com acerto no cache (p50/p95/p99)."""
+        def percentis(resumo):
+            if resumo is None:
+                return '-'
+            return f"{resumo['total']}× {resumo['p50_ms']:.2f}/{resumo['p95_ms']:.2f}/{resumo['p99_ms']:.2f}"
+
+        resumos = [(nome, self.metricas.resumo(etapa)) for etapa, nome in MetricasDesempenho.ETAPAS.items()]
+        resumos = [(nome, resumo) for nome, resumo in resumos if resumo is not None]
+        if not resumos:
+            return
+        print(f"{Colors.GOTHAM_TEXT}Latência por etapa (medições, média e p50/p95/p99 em ms):{Colors.ENDC}")
+        for nome, resumo in resumos:
+            print(f"  {Colors.GOTHAM_TEXT}{nome}: {Colors.BOLD}{resumo['total']}× {resumo['media_ms']:.2f} "
+                  f"({resumo['p50_ms']:.2f}/{resumo['p95_ms']:.2f}/{resumo['p99_ms']:.2f}){Colors.ENDC}")
+        abas = set(self.metricas.abas('busca')) | set(self.metricas.abas('busca_cache'))
+        if abas:
+            print(f"{Colors.GOTHAM_TEXT}Latência das buscas por setor (sem cache | cache, p50/p95/p99 em ms):{Colors.ENDC}")
+            for nome_aba in [nome for nome in self.nomes_abas if nome in abas]:
+                print(f"  {Colors.GOTHAM_TEXT}{nome_aba}: {Colors.BOLD}{percentis(self.metricas.resumo('busca', nome_aba))}"
+                      f" | {percentis(self.metricas.resumo('busca_cache', nome_aba))}{Colors.ENDC}")
+        if self.metricas.arquivo:
+            print(f"{Colors.GOTHAM_TEXT}Arquivo de métricas: {Colors.BOLD}{self.metricas.arquivo}{Colors.ENDC}")
+
+    def exportar_metricas(self, caminho='metricas_desempenho.jsonl'):
+        """Exporta os resumos de latência (por etapa e por setor) em JSON Lines."""
+        try:
+            total = self.metricas.exportar(caminho)
+            print(f"{Colors.BATMAN_YELLOW}✓ {total} resumo(s) de métricas exportado(s) para '{caminho}'!{Colors.ENDC}")
+        except OSError as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível exportar as métricas: {e}{Colors.ENDC}")
+
+    def _mostrar_memoria_abas(self):
+        """Exibe, por setor carregado, a memória do texto de busca como coluna e como armazenado."""
+        memoria = dict(self.memoria_abas)
+        if not memoria:
+            return
+        modo = 'compacto' if self.config.get('armazenamento_compacto') else 'padrão'
+        total_coluna = sum(coluna for coluna, _ in memoria.values())
+        total_armazenado = sum(armazenado for _, armazenado in memoria.values())
+        print(
+            f"{Colors.GOTHAM_TEXT}Texto de busca ({modo}): {Colors.BOLD}{total_armazenado / (1024 * 1024):.2f} MB "
+            f"(economia de {(total_coluna - total_armazenado) / (1024 * 1024):.2f} MB em {len(memoria)} setores){Colors.ENDC}")
+        for nome_aba in [nome for nome in self.nomes_abas if nome in memoria]:
+            coluna, armazenado = memoria[nome_aba]
+            reducao = 100 * (coluna - armazenado) / coluna if coluna else 0
+            print(f"  {Colors.GOTHAM_TEXT}{nome_aba}: {Colors.BOLD}{coluna / 1024:.0f} KB → {armazenado / 1024:.0f} KB "
+                  f"(-{reducao:.0f}%){Colors.ENDC}")
+
     def limpar_cache(self):
-        """Limpa o cache de busca (dicionário 'cache_busca') para liberar memória."""
-        self.cache_busca.clear()
+        """Limpa o cache de busca ('cache_busca') para liberar memória."""
+        self.cache_busca.limpar()
         print(f"{Colors.BATMAN_YELLOW}✓ Cache de busca limpo com sucesso! {Colors.ENDC}")
 
     def salvar_configuracao(self):
@@ -601,6 +2276,35 @@ class MecanismoBuscaAvancado:
 # =================================================================================
 # Funções simples que auxiliam na formatação do terminal e outras tarefas menores.
 
+# Mecanismo de busca de cada processo da busca global (criado por '_iniciar_processo_busca').
+_BUSCADOR_PROCESSO = None
+
+
+def _iniciar_processo_busca(nome_arquivo_excel, config_extra=None):
+    """
+    Inicializa um processo da busca global (ou do processamento em lote), carregando o próprio
+    mecanismo de busca (sem mensagens) com a configuração repassada pelo processo principal. Os
+    trabalhadores leem o snapshot, mas só o processo principal o grava; também não aquecem,
+    recarregam nem medem.
+    """
+    global _BUSCADOR_PROCESSO
+    sys.stdout = open(os.devnull, 'w')  # Os processos trabalhadores não escrevem no terminal.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # O Ctrl+C cancela a busca no processo principal.
+    _BUSCADOR_PROCESSO = MecanismoBuscaAvancado(
+        nome_arquivo_excel, dict(config_extra or {}, aquecimento_em_segundo_plano=False, intervalo_recarga_segundos=0,
+                                 arquivo_metricas='', somente_leitura_snapshot=True))
+
+
+def _buscar_aba_em_processo(nome_aba, termo, filtros, max_resultados):
+    """Executa, em um processo trabalhador, a busca pontuada de uma aba para a busca global."""
+    return _BUSCADOR_PROCESSO._buscar_aba_pontuada(nome_aba, termo, filtros, max_resultados)
+
+
+def _consultar_lote_em_processo(termo, nome_aba, filtros, max_resultados):
+    """Executa, em um processo trabalhador, uma consulta do processamento em lote."""
+    return ProcessadorLote.executar_consulta(_BUSCADOR_PROCESSO, termo, nome_aba, filtros, max_resultados)
+
+
 def center_text(text, width):
     """Função utilitária para centralizar texto no terminal, baseada na largura da janela."""
     return text.center(width)
@@ -624,11 +2328,140 @@ def get_user_confirmation():
 # =================================================================================
 # Funções dedicadas à criação de frases prontas (fraseologias) para autorizações,
 # negativas e orientações, com a opção de copiar o texto para a área de transferência.
+# As funções 'montar_*' geram o texto sem interação (usadas pelo terminal e pelo servidor local),
+# a partir das fraseologias pré-compiladas na importação (ModeloFraseologia).
+
+# Ordem em que os campos (placeholders '{campo}') das negativas são pedidos; campos de modelos
+# novos, fora desta lista, são pedidos depois, na ordem em que aparecem no texto.
+CAMPOS_NEGATIVA = ['procedimento', 'procedimento01', 'procedimento02', 'data_disponivel', 'data_vigencia',
+                   'cidade_estado', 'nome_plano']
+CAMPOS_NEGATIVA_OPCIONAIS = ['nome_plano']  # Os demais campos das negativas são obrigatórios.
+# Ordem dos campos das fraseologias de finalização (todos obrigatórios).
+CAMPOS_FINALIZACAO = ['documentacao', 'procedimento', 'senha', 'prestador']
+# Campos de cada procedimento da fraseologia de autorização (todos obrigatórios).
+CAMPOS_POSITIVA = ['procedimento', 'senha', 'prestador']
+
+
+def limpar_fraseologia(frase):
+    """Remove as linhas vazias e os espaços nas bordas de cada linha da fraseologia."""
+    return os.linesep.join([s.strip() for s in frase.splitlines() if s.strip()])
+
+
+class ModeloFraseologia:
+    """
+    Fraseologia pré-compilada. O texto modelo é normalizado uma única vez (linhas sem espaços nas
+    bordas, sem linhas vazias) e dividido em trechos fixos e placeholders ('{campo}'), descobertos
+    automaticamente; gerar a frase é apenas juntar os trechos com os valores. Um campo sem valor
+    mantém o placeholder no texto.
+    """
+
+    _PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, frase_modelo, normalizar=True):
+        self.normalizar = normalizar  # False mantém o texto como escrito (linhas em branco e espaços).
+        # Trechos fixos nas posições pares e nomes dos campos nas ímpares.
+        self._partes = self._PLACEHOLDER.split(limpar_fraseologia(frase_modelo) if normalizar else frase_modelo)
+        self.campos = list(dict.fromkeys(self._partes[1::2]))  # Campos do modelo, na ordem em que aparecem.
+
+    def renderizar(self, valores):
+        """Gera a frase com os valores informados (campo -> texto)."""
+        partes = self._partes.copy()
+        quebra_linha = False
+        for i in range(1, len(partes), 2):
+            valor = valores.get(partes[i])
+            if valor:
+                partes[i] = valor
+                quebra_linha = quebra_linha or '\n' in valor or '\r' in valor
+            else:
+                partes[i] = '{' + partes[i] + '}'
+        frase = ''.join(partes)
+        # Só um valor com várias linhas exige normalizar de novo o texto gerado.
+        return limpar_fraseologia(frase) if quebra_linha and self.normalizar else frase
+
+
+# Fraseologias compiladas uma única vez, na importação, a partir dos dicionários de dados.
+MODELOS_NEGATIVA = {codigo: ModeloFraseologia(info['fraseologia']) for codigo, info in DADOS_RESTRICOES.items()}
+MODELOS_FINALIZACAO = {codigo: ModeloFraseologia(info['fraseologia'])
+                       for codigo, info in FERRAMENTAS_FINALIZACAO.items()}
+# Os textos de orientação são copiados exatamente como escritos, com as linhas em branco.
+MODELOS_TEXTO = {chave: ModeloFraseologia(info['fraseologia'], normalizar=False)
+                 for chave, info in FERRAMENTAS_TEXTO.items()}
+
+
+def campos_fraseologia(modelo, ordem):
+    """
+    Retorna os campos do modelo na ordem de preenchimento: primeiro os listados em 'ordem', depois
+    os demais, na ordem em que aparecem no texto.
+    """
+    return sorted(modelo.campos, key=lambda campo: ordem.index(campo) if campo in ordem else len(ordem))
+
+
+def montar_fraseologia_positiva(itens):
+    """
+    Monta a fraseologia de autorização para uma lista de procedimentos (dicionários com 'procedimento',
+    'senha' e 'prestador'). Levanta ValueError se a lista estiver vazia ou se faltar algum campo.
+    """
+    if not itens:
+        raise ValueError("Informe ao menos um procedimento.")
+    fraseologia_base = """
+PREZADO(A) SR(A). [_NM_BENEFICIARIO_],
+NÚMERO DO PROTOCOLO: [_NU_PROTOCOLO_]
+
+SUA SOLICITAÇÃO DE AUTORIZAÇÃO PARA EXAME FOI RECEBIDA COM OS SEGUINTES DADOS:
+"""
+    mensagem_contato = """
+EM CASO DE DÚVIDAS, POR FAVOR, ENTRE EM CONTATO COM A CENTRAL DE ATENDIMENTO PELOS TELEFONES: 4090-1740, 0800 409 1740 OU 0800 463 4648.
+"""
+    blocos = []
+    for item in itens:
+        procedimento = str(item.get('procedimento') or '').strip().upper()
+        senha = str(item.get('senha') or '').strip()
+        prestador = str(item.get('prestador') or '').strip().upper()
+        if not procedimento or not senha or not prestador:
+            raise ValueError("Todos os campos são obrigatórios.")
+        blocos.append(f"\nPROCEDIMENTO: {procedimento}\nSENHA: {senha}\nPRESTADOR: {prestador}")
+    return limpar_fraseologia(fraseologia_base + "\n=================".join(blocos) + mensagem_contato)
+
+
+def montar_fraseologia_negativa(codigo, campos):
+    """
+    Monta a fraseologia de negativa do código informado, preenchendo os placeholders com os valores
+    de 'campos' (nome do campo -> valor). Levanta ValueError para código inválido ou campo obrigatório vazio.
+    """
+    modelo = MODELOS_NEGATIVA.get(codigo)
+    if modelo is None:
+        raise ValueError(f"Código de negativa inválido: {codigo}.")
+    valores = {}
+    for nome_campo in campos_fraseologia(modelo, CAMPOS_NEGATIVA):
+        valor = str(campos.get(nome_campo) or '').strip()
+        if not valor and nome_campo not in CAMPOS_NEGATIVA_OPCIONAIS:
+            raise ValueError(f"O campo '{nome_campo.replace('_', ' ')}' é obrigatório.")
+        valores[nome_campo] = valor
+    return modelo.renderizar(valores)
+
+
+def montar_fraseologia_finalizacao(codigo, campos):
+    """
+    Monta a fraseologia de finalização do código informado (chave de FERRAMENTAS_FINALIZACAO),
+    preenchendo os placeholders com os valores de 'campos'. Levanta ValueError para código
+    inválido ou campo vazio.
+    """
+    modelo = MODELOS_FINALIZACAO.get(codigo)
+    if modelo is None:
+        raise ValueError(f"Código de finalização inválido: {codigo}.")
+    valores = {}
+    for nome_campo in campos_fraseologia(modelo, CAMPOS_FINALIZACAO):
+        valor = str(campos.get(nome_campo) or '').strip()
+        if not valor:
+            raise ValueError(f"O campo '{nome_campo.replace('_', ' ')}' é obrigatório.")
+        valores[nome_campo] = valor
+    return modelo.renderizar(valores)
+
 
 def gerar_texto_reembolso():
     """Gera, exibe e copia a fraseologia para orientação de reembolso para PPO."""
     try:
-        frase_reembolso = FERRAMENTAS_TEXTO['REEMBOLSO']['fraseologia']
+        frase_reembolso = MODELOS_TEXTO['REEMBOLSO'].renderizar({})
         pyperclip.copy(frase_reembolso)  # Copia para a área de transferência.
         print(f"\n{Colors.BATMAN_YELLOW}✓ Texto de Reembolso para PPO copiado para a área de transferência!{Colors.ENDC}")
         # Exibe o texto gerado no terminal.
@@ -654,14 +2487,7 @@ def gerar_fraseologia_positiva():
             print(f"{Colors.BATMAN_YELLOW}Entrada inválida. Digite um número inteiro.{Colors.ENDC}")
             return
 
-        # Estrutura da frase de autorização.
-        fraseologia_base = """
-PREZADO(A) SR(A). [_NM_BENEFICIARIO_],
-NÚMERO DO PROTOCOLO: [_NU_PROTOCOLO_]
-
-SUA SOLICITAÇÃO DE AUTORIZAÇÃO PARA EXAME FOI RECEBIDA COM OS SEGUINTES DADOS:
-"""
-        corpo_fraseologia = ""
+        itens = []
         # Loop para coletar dados de cada procedimento.
         for i in range(num_procedimentos):
             procedimento = input(
@@ -673,24 +2499,14 @@ SUA SOLICITAÇÃO DE AUTORIZAÇÃO PARA EXAME FOI RECEBIDA COM OS SEGUINTES DADO
                 print(f"{Colors.BATMAN_YELLOW}Todos os campos são obrigatórios. Saindo.{Colors.ENDC}")
                 return
 
-            # Formata o bloco de texto para o procedimento atual.
-            corpo_fraseologia += f"\nPROCEDIMENTO: {procedimento}"
-            corpo_fraseologia += f"\nSENHA: {senha}"
-            corpo_fraseologia += f"\nPRESTADOR: {prestador}"
-            if i < num_procedimentos - 1:
-                corpo_fraseologia += "\n================="
-
-        mensagem_contato = """
-EM CASO DE DÚVIDAS, POR FAVOR, ENTRE EM CONTATO COM A CENTRAL DE ATENDIMENTO PELOS TELEFONES: 4090-1740, 0800 409 1740 OU 0800 463 4648.
-"""
-        frase_final = fraseologia_base + corpo_fraseologia + mensagem_contato
+            itens.append({'procedimento': procedimento, 'senha': senha, 'prestador': prestador})
 
         if not get_user_confirmation():
             print(f"{Colors.BATMAN_YELLOW}Geração cancelada.{Colors.ENDC}")
             return
 
-        # Limpa quebras de linha e espaços extras antes de copiar.
-        frase_limpa = os.linesep.join([s.strip() for s in frase_final.splitlines() if s.strip()])
+        # Monta o texto (um bloco por procedimento), já sem linhas vazias, e copia.
+        frase_limpa = montar_fraseologia_positiva(itens)
         pyperclip.copy(frase_limpa)
 
         print(
@@ -716,54 +2532,34 @@ def gerar_fraseologia_negativa():
         print(f"{Colors.BATMAN_YELLOW}Código de negativa inválido.{Colors.ENDC}")
         return
 
-    info_negativa = DADOS_RESTRICOES[escolha_negativa]
-    frase_modelo = info_negativa['fraseologia']
     campos_a_preencher = {}
 
-    # Lista de placeholders possíveis e seus nomes amigáveis.
-    campos_disponiveis = [
-        ('procedimento', '{procedimento}'),
-        ('procedimento01', '{procedimento01}'),
-        ('procedimento02', '{procedimento02}'),
-        ('data_disponivel', '{data_disponivel}'),
-        ('data_vigencia', '{data_vigencia}'),
-        ('cidade_estado', '{cidade_estado}'),
-        ('nome_plano', '{nome_plano}')
-    ]
-
-    # Verifica quais placeholders estão presentes na fraseologia e pede o preenchimento.
-    for nome_campo, placeholder in campos_disponiveis:
-        if placeholder in frase_modelo:
-            # Personaliza o prompt de entrada dependendo do campo (data, cidade, etc.).
-            if nome_campo == 'data_disponivel' or nome_campo == 'data_vigencia':
-                input_prompt = f"{Colors.GOTHAM_TEXT}{nome_campo.replace('_', ' ').capitalize()} (dd/mm/aaaa): {Colors.BATMAN_YELLOW}"
-            elif nome_campo == 'cidade_estado':
-                input_prompt = f"{Colors.GOTHAM_TEXT}Cidade ou Estado: {Colors.BATMAN_YELLOW}"
-            else:
-                input_prompt = f"{Colors.GOTHAM_TEXT}{nome_campo.replace('_', ' ').capitalize()}: {Colors.BATMAN_YELLOW}"
+    # Pede o preenchimento apenas dos placeholders presentes na fraseologia.
+    for nome_campo in campos_fraseologia(MODELOS_NEGATIVA[escolha_negativa], CAMPOS_NEGATIVA):
+        # Personaliza o prompt de entrada dependendo do campo (data, cidade, etc.).
+        if nome_campo == 'data_disponivel' or nome_campo == 'data_vigencia':
+            input_prompt = f"{Colors.GOTHAM_TEXT}{nome_campo.replace('_', ' ').capitalize()} (dd/mm/aaaa): {Colors.BATMAN_YELLOW}"
+        elif nome_campo == 'cidade_estado':
+            input_prompt = f"{Colors.GOTHAM_TEXT}Cidade ou Estado: {Colors.BATMAN_YELLOW}"
+        else:
+            input_prompt = f"{Colors.GOTHAM_TEXT}{nome_campo.replace('_', ' ').capitalize()}: {Colors.BATMAN_YELLOW}"
 
-            valor_campo = input(input_prompt).strip()
+        valor_campo = input(input_prompt).strip()
 
-            # Validação: Alguns campos são obrigatórios.
-            if not valor_campo and nome_campo in ['procedimento', 'procedimento01', 'procedimento02', 'data_disponivel',
-                                                  'data_vigencia', 'cidade_estado']:
-                print(
-                    f"{Colors.BATMAN_YELLOW}O campo '{nome_campo.replace('_', ' ')}' é obrigatório. Saindo.{Colors.ENDC}")
-                return
-            campos_a_preencher[placeholder] = valor_campo
+        # Validação: Alguns campos são obrigatórios.
+        if not valor_campo and nome_campo not in CAMPOS_NEGATIVA_OPCIONAIS:
+            print(
+                f"{Colors.BATMAN_YELLOW}O campo '{nome_campo.replace('_', ' ')}' é obrigatório. Saindo.{Colors.ENDC}")
+            return
+        campos_a_preencher[nome_campo] = valor_campo
 
     if not get_user_confirmation():
         print(f"{Colors.BATMAN_YELLOW}Geração cancelada.{Colors.ENDC}")
         return
 
     try:
-        frase_gerada = frase_modelo
         # Substitui os placeholders na frase modelo pelos valores inseridos.
-        for placeholder, valor in campos_a_preencher.items():
-            if valor:
-                frase_gerada = frase_gerada.replace(placeholder, valor)
-
-        frase_limpa = os.linesep.join([s.strip() for s in frase_gerada.splitlines() if s.strip()])
+        frase_limpa = montar_fraseologia_negativa(escolha_negativa, campos_a_preencher)
         pyperclip.copy(frase_limpa)
 
         print(f"\n{Colors.BATMAN_YELLOW}✓ Fraseologia de Negativa copiada para a área de transferência!{Colors.ENDC}")
@@ -794,37 +2590,27 @@ def gerar_fraseologia_finalizacao():
         print(f"{Colors.BATMAN_YELLOW}Código de finalização inválido.{Colors.ENDC}")
         return
 
-    info_finalizacao = FERRAMENTAS_FINALIZACAO[escolha_finalizacao]
-    frase_modelo = info_finalizacao['fraseologia']
     campos_a_preencher = {}
 
-    # Check for specific placeholders and prompt for them
-    placeholders = ['{documentacao}', '{procedimento}', '{senha}', '{prestador}']
     # Pede o preenchimento de placeholders específicos que a frase atual possua.
-    for placeholder in placeholders:
-        if placeholder in frase_modelo:
-            campo_nome = placeholder.strip('{}')
-            valor_campo = input(
-                f"{Colors.GOTHAM_TEXT}{campo_nome.replace('_', ' ').capitalize()}: {Colors.BATMAN_YELLOW}").strip()
-
-            # Validação: Alguns campos são obrigatórios.
-            if not valor_campo and campo_nome in ['procedimento', 'senha', 'prestador', 'documentacao']:
-                print(
-                    f"{Colors.BATMAN_YELLOW}O campo '{campo_nome.replace('_', ' ')}' é obrigatório. Saindo.{Colors.ENDC}")
-                return
-            campos_a_preencher[placeholder] = valor_campo
+    for campo_nome in campos_fraseologia(MODELOS_FINALIZACAO[escolha_finalizacao], CAMPOS_FINALIZACAO):
+        valor_campo = input(
+            f"{Colors.GOTHAM_TEXT}{campo_nome.replace('_', ' ').capitalize()}: {Colors.BATMAN_YELLOW}").strip()
+
+        # Validação: todos os campos são obrigatórios.
+        if not valor_campo:
+            print(
+                f"{Colors.BATMAN_YELLOW}O campo '{campo_nome.replace('_', ' ')}' é obrigatório. Saindo.{Colors.ENDC}")
+            return
+        campos_a_preencher[campo_nome] = valor_campo
 
     if not get_user_confirmation():
         print(f"{Colors.BATMAN_YELLOW}Geração cancelada.{Colors.ENDC}")
         return
 
     try:
-        frase_gerada = frase_modelo
         # Substitui os placeholders.
-        for placeholder, valor in campos_a_preencher.items():
-            frase_gerada = frase_gerada.replace(placeholder, valor)
-
-        frase_limpa = os.linesep.join([s.strip() for s in frase_gerada.splitlines() if s.strip()])
+        frase_limpa = montar_fraseologia_finalizacao(escolha_finalizacao, campos_a_preencher)
         pyperclip.copy(frase_limpa)
 
         print(
@@ -914,6 +2700,61 @@ def exibir_menu_ferramentas_texto(terminal_width):
         input(f"{Colors.GOTHAM_TEXT}Pressione ENTER para continuar...{Colors.ENDC}")
 
 
+def executar_loop_busca(buscador, nome_setor, funcao_busca):
+    """Loop de busca contínua: lê termos, executa 'funcao_busca(termo)' e exibe os resultados."""
+    termos_voltar = ['V', 'VOLTAR']
+    print(f"\n{Colors.GOTHAM_TEXT}Dica: use campo:valor, \"frase exata\" e -termo para refinar a busca.{Colors.ENDC}")
+    while True:
+        termo = input(
+            f"\n{Colors.GOTHAM_TEXT}Termo de busca (digite '{' ou '.join(termos_voltar)}' para retornar ao menu):{Colors.ENDC}\n{Colors.BATMAN_YELLOW}➜ {Colors.ENDC}").strip()
+
+        if termo.upper() in termos_voltar:
+            break
+
+        if termo:
+            # Executa a busca em segundo plano; Ctrl+C ou um novo termo digitado a cancelam.
+            inicio = time.time()
+            futuro, token = buscador.executor_buscas.submeter(funcao_busca, termo)
+            try:
+                resultados = aguardar_busca(futuro, token)
+            except BuscaCancelada:
+                continue
+            tempo = time.time() - inicio
+            buscador.exibir_resultados_avancados(resultados, termo, nome_setor, tempo)
+
+
+def aguardar_busca(futuro, token):
+    """
+    Aguarda o resultado de uma busca em segundo plano sem travar o terminal. Ctrl+C cancela a busca;
+    um novo termo digitado também, e o termo fica no buffer do terminal para a próxima leitura.
+    Levanta BuscaCancelada quando a busca é interrompida.
+    """
+    try:
+        while True:
+            try:
+                return futuro.result(timeout=0.05)
+            except concurrent.futures.TimeoutError:
+                if entrada_pendente():
+                    token.cancelar()
+                    print(f"\n{Colors.BATMAN_YELLOW}✗ Busca anterior cancelada: novo termo recebido.{Colors.ENDC}")
+                    raise BuscaCancelada()
+    except KeyboardInterrupt:
+        token.cancelar()
+        print(f"\n{Colors.BATMAN_YELLOW}✗ Busca cancelada pelo operador.{Colors.ENDC}")
+        raise BuscaCancelada()
+
+
+def entrada_pendente():
+    """Indica se o operador digitou algo no terminal enquanto a busca estava em andamento."""
+    if msvcrt is not None:
+        return msvcrt.kbhit()
+    try:
+        # Sem terminal interativo (entrada redirecionada), não há como diferenciar uma digitação nova.
+        return sys.stdin.isatty() and bool(select.select([sys.stdin], [], [], 0)[0])
+    except (OSError, ValueError):
+        return False
+
+
 def exibir_menu_setores_dados(buscador, nomes_abas, terminal_width):
     """Exibe o menu para seleção de setores de dados (abas do Excel) e gerencia a busca."""
     while True:
@@ -951,7 +2792,9 @@ def exibir_menu_setores_dados(buscador, nomes_abas, terminal_width):
                 print(linha)
 
         print(
-            f"\n  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [V]{Colors.ENDC} {Colors.GOTHAM_TEXT}Voltar ao menu principal{Colors.ENDC}")
+            f"\n  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [G]{Colors.ENDC} {Colors.GOTHAM_TEXT}Busca global (todos os setores){Colors.ENDC}")
+        print(
+            f"  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [V]{Colors.ENDC} {Colors.GOTHAM_TEXT}Voltar ao menu principal{Colors.ENDC}")
         print(f"{Colors.GOTHAM_TEXT}{center_text('═' * 60, terminal_width)}{Colors.ENDC}")
 
         escolha_aba = input(f"{Colors.GOTHAM_TEXT}Comando > {Colors.BATMAN_YELLOW}").strip().upper()
@@ -959,30 +2802,33 @@ def exibir_menu_setores_dados(buscador, nomes_abas, terminal_width):
         if escolha_aba in ['V', 'VOLTAR']:
             break
 
+        if escolha_aba == 'G':
+            print(f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}--- BUSCA GLOBAL ---{Colors.ENDC}")
+            print(f"  {Colors.GOTHAM_TEXT}A consulta será feita em todos os {len(nomes_abas)} setores.{Colors.ENDC}")
+            executar_loop_busca(buscador, 'TODOS OS SETORES', buscador.buscar_global)
+            continue
+
         # Verifica se a escolha é um número válido de aba.
         if escolha_aba.isdigit() and 1 <= int(escolha_aba) <= len(nomes_abas):
             nome_aba_selecionada = nomes_abas[int(escolha_aba) - 1]
 
+            # No modo sob demanda, a aba é lida e preparada aqui, na primeira seleção.
+            try:
+                buscador.carregar_aba(nome_aba_selecionada)
+            except Exception as e:
+                print(f"{Colors.BATMAN_YELLOW}✗ Falha ao carregar o setor '{nome_aba_selecionada}': {e}{Colors.ENDC}")
+                input(f"{Colors.GOTHAM_TEXT}Pressione ENTER para continuar...{Colors.ENDC}")
+                continue
+
             print(f"\n{Colors.BOLD}{Colors.BATMAN_YELLOW}--- STATUS DO SETOR ---{Colors.ENDC}")
             print(
                 f"  {Colors.BATMAN_YELLOW}► Setor {Colors.BOLD}{nome_aba_selecionada}{Colors.ENDC} {Colors.BATMAN_YELLOW}ativado. Status: {Colors.BOLD}[ONLINE]{Colors.ENDC}")
             print(f"  {Colors.GOTHAM_TEXT}Aguardando consulta...{Colors.ENDC}")
 
-            # Loop de busca contínua dentro da aba selecionada.
-            termos_voltar = ['V', 'VOLTAR']
-            while True:
-                termo = input(
-                    f"\n{Colors.GOTHAM_TEXT}Termo de busca (digite '{' ou '.join(termos_voltar)}' para retornar ao menu):{Colors.ENDC}\n{Colors.BATMAN_YELLOW}➜ {Colors.ENDC}").strip()
-
-                if termo.upper() in termos_voltar:
-                    break
-
-                if termo:
-                    # Executa a busca avançada e exibe os resultados.
-                    inicio = time.time()
-                    resultados = buscador.buscar_avancada(nome_aba_selecionada, termo)
-                    tempo = time.time() - inicio
-                    buscador.exibir_resultados_avancados(resultados, termo, nome_aba_selecionada, tempo)
+            # Busca incremental: termos que estendem a busca anterior analisam só as linhas dela.
+            executar_loop_busca(buscador, nome_aba_selecionada,
+                                lambda termo, cancelamento: buscador.buscar_incremental(
+                                    nome_aba_selecionada, termo, cancelamento=cancelamento))
         else:
             print(f"{Colors.BATMAN_YELLOW}✗ Erro de sintaxe: Comando não reconhecido. Tente novamente.{Colors.ENDC}")
             input(f"{Colors.GOTHAM_TEXT}Pressione ENTER para continuar...{Colors.ENDC}")
@@ -1007,7 +2853,9 @@ def exibir_menu_ferramentas_sistema(buscador, terminal_width):
         print(
             f"  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [CFG]{Colors.ENDC} {Colors.GOTHAM_TEXT}Salvar configurações do sistema{Colors.ENDC}")
         print(
-            f"  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [RE]{Colors.ENDC} {Colors.GOTHAM_TEXT}Reiniciar sistema{Colors.ENDC}")
+            f"  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [RE]{Colors.ENDC} {Colors.GOTHAM_TEXT}Recarregar matriz de dados (setores alterados){Colors.ENDC}")
+        print(
+            f"  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [ME]{Colors.ENDC} {Colors.GOTHAM_TEXT}Exportar métricas de desempenho (JSON Lines){Colors.ENDC}")
         print(
             f"\n  {Colors.BOLD}{Colors.BATMAN_YELLOW}► [V]{Colors.ENDC} {Colors.GOTHAM_TEXT}Voltar ao menu principal{Colors.ENDC}")
         print(f"{Colors.GOTHAM_TEXT}{center_text('═' * 60, terminal_width)}{Colors.ENDC}")
@@ -1021,11 +2869,15 @@ def exibir_menu_ferramentas_sistema(buscador, terminal_width):
         elif escolha == 'CFG':
             buscador.salvar_configuracao()
         elif escolha == 'RE':
-            # Reinicia a execução do script.
-            os.system('cls' if os.name == 'nt' else 'clear')
-            print(f"{Colors.BATMAN_YELLOW}Reiniciando sistema...{Colors.ENDC}")
-            main()
-            return
+            # Recarrega, sem reiniciar o programa, apenas os setores alterados na planilha.
+            print(f"{Colors.BATMAN_YELLOW}Recarregando matriz de dados...{Colors.ENDC}")
+            alteradas = buscador.recarregar_alteracoes()
+            if alteradas:
+                print(f"{Colors.BATMAN_YELLOW}✓ Setores recarregados: {Colors.BOLD}{', '.join(alteradas)}{Colors.ENDC}")
+            elif alteradas is not None:
+                print(f"{Colors.BATMAN_YELLOW}✓ Nenhuma alteração encontrada na matriz de dados.{Colors.ENDC}")
+        elif escolha == 'ME':
+            buscador.exportar_metricas()
         elif escolha in ['V', 'VOLTAR']:
             break
         else:
@@ -1034,16 +2886,756 @@ def exibir_menu_ferramentas_sistema(buscador, terminal_width):
 
 
 # =================================================================================
-# BLOCO 7: PONTO DE ENTRADA DO PROGRAMA
+# BLOCO 7: SERVIDOR LOCAL E MODO CLIENTE
+# =================================================================================
+# Serviço HTTP/JSON em 127.0.0.1 que carrega a matriz de dados uma única vez e atende vários
+# terminais, e o cliente que permite ao terminal usar esse servidor em vez de carregar a planilha.
+
+class ErroRequisicao(Exception):
+    """Erro de uma requisição ao servidor local, com o status HTTP da resposta."""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class ServidorBusca:
+    """
+    Servidor HTTP/JSON local (asyncio, apenas em 127.0.0.1) que compartilha um único mecanismo de
+    busca entre os clientes: a planilha é lida e preparada uma vez, e o cache, as estatísticas e as
+    métricas são os mesmos para todos. As conexões são atendidas no laço de eventos e cada
+    requisição roda em um pool de threads, então uma busca lenta não bloqueia as demais.
+    """
+
+    HOST = '127.0.0.1'  # Apenas conexões da própria máquina.
+    TAMANHO_MAXIMO_CORPO = 1024 * 1024  # Tamanho máximo do corpo de uma requisição, em bytes.
+    TEMPO_OCIOSO_SEGUNDOS = 60  # Conexões sem nova requisição nesse intervalo são encerradas.
+    _MOTIVOS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+    def __init__(self, buscador, porta=8765, trabalhadores=4):
+        self.buscador = buscador
+        self.porta = porta  # 0 escolhe uma porta livre (atualizada ao iniciar).
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='servidor')
+        self.requisicoes = 0  # Requisições atendidas desde o início.
+        self._rotas = {
+            ('GET', '/saude'): self._saude,
+            ('GET', '/abas'): self._abas,
+            ('POST', '/abas/carregar'): self._carregar_aba,
+            ('POST', '/buscar'): self._buscar,
+            ('GET', '/estatisticas'): self._estatisticas,
+            ('POST', '/cache/limpar'): self._limpar_cache,
+            ('POST', '/recarregar'): self._recarregar,
+            ('GET', '/fraseologias'): self._listar_fraseologias,
+            ('POST', '/fraseologia'): self._gerar_fraseologia,
+        }
+
+    def executar(self):
+        """Inicia o servidor e atende as requisições até o Ctrl+C."""
+        try:
+            asyncio.run(self._servir())
+        except KeyboardInterrupt:
+            print(f"\n{Colors.BATMAN_YELLOW}Servidor encerrado.{Colors.ENDC}")
+        finally:
+            self._pool.shutdown(wait=False)
+            self.buscador._encerrar_pool_processos()
+
+    async def _servir(self):
+        servidor = await asyncio.start_server(self._atender, self.HOST, self.porta)
+        self.porta = servidor.sockets[0].getsockname()[1]
+        print(f"{Colors.BATMAN_YELLOW}✓ Servidor de busca em {Colors.BOLD}http://{self.HOST}:{self.porta}{Colors.ENDC}"
+              f"{Colors.BATMAN_YELLOW} ({len(self.buscador.nomes_abas)} setores). Ctrl+C encerra.{Colors.ENDC}")
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def _atender(self, leitor, escritor):
+        """Atende as requisições de uma conexão (mantida aberta entre requisições) até o cliente encerrá-la."""
+        try:
+            while True:
+                try:
+                    requisicao = await asyncio.wait_for(self._ler_requisicao(leitor), self.TEMPO_OCIOSO_SEGUNDOS)
+                except ErroRequisicao as e:
+                    self._escrever_resposta(escritor, e.status, {'erro': str(e)}, False)
+                    await escritor.drain()
+                    break
+                if requisicao is None:
+                    break
+                metodo, alvo, corpo, manter = requisicao
+                status, resposta = await self._despachar(metodo, alvo, corpo)
+                self._escrever_resposta(escritor, status, resposta, manter)
+                await escritor.drain()
+                if not manter:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # Conexão ociosa, interrompida ou com linhas longas demais: apenas é encerrada.
+        finally:
+            escritor.close()
+
+    async def _ler_requisicao(self, leitor):
+        """
+        Lê uma requisição HTTP/1.x e retorna (método, alvo, corpo, manter conexão), ou None se o
+        cliente encerrou a conexão. Levanta ErroRequisicao para requisições malformadas.
+        """
+        linha = await leitor.readline()
+        if not linha:
+            return None
+        try:
+            metodo, alvo, versao = linha.decode('latin-1').split()
+        except ValueError:
+            raise ErroRequisicao(400, 'Linha de requisição inválida.')
+        cabecalhos = {}
+        while True:
+            linha = await leitor.readline()
+            if linha in (b'\r\n', b'\n', b''):
+                break
+            nome, _, valor = linha.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        try:
+            tamanho = int(cabecalhos.get('content-length') or 0)
+        except ValueError:
+            raise ErroRequisicao(400, 'Content-Length inválido.')
+        if tamanho > self.TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(413, 'Corpo da requisição grande demais.')
+        corpo = await leitor.readexactly(tamanho) if tamanho > 0 else b''
+        conexao = cabecalhos.get('connection', '').lower()
+        manter = conexao == 'keep-alive' if versao == 'HTTP/1.0' else conexao != 'close'
+        return metodo.upper(), alvo, corpo, manter
+
+    async def _despachar(self, metodo, alvo, corpo):
+        """
+        Encontra o tratador da rota e o executa no pool de threads, com os parâmetros da URL e o
+        objeto JSON do corpo. Retorna (status HTTP, resposta).
+        """
+        self.requisicoes += 1
+        endereco = urllib.parse.urlsplit(alvo)
+        rota = endereco.path.rstrip('/') or '/'
+        try:
+            tratador = self._rotas.get((metodo, rota))
+            if tratador is None:
+                if any(caminho == rota for _, caminho in self._rotas):
+                    raise ErroRequisicao(405, f"Método {metodo} não permitido em {rota}.")
+                raise ErroRequisicao(404, f"Rota não encontrada: {rota}.")
+            dados = {chave: valores[-1] for chave, valores in urllib.parse.parse_qs(endereco.query).items()}
+            if corpo:
+                try:
+                    conteudo = json.loads(corpo.decode('utf-8'))
+                except ValueError:
+                    raise ErroRequisicao(400, 'O corpo da requisição não é um JSON válido.')
+                if not isinstance(conteudo, dict):
+                    raise ErroRequisicao(400, 'O corpo da requisição deve ser um objeto JSON.')
+                dados.update(conteudo)
+            resposta = await asyncio.get_running_loop().run_in_executor(self._pool, tratador, dados)
+            return 200, resposta
+        except ErroRequisicao as e:
+            return e.status, {'erro': str(e)}
+        except Exception as e:
+            return 500, {'erro': f"Falha interna: {e}"}
+
+    def _escrever_resposta(self, escritor, status, resposta, manter):
+        corpo = json.dumps(resposta, ensure_ascii=False, default=str).encode('utf-8')
+        cabecalho = (f"HTTP/1.1 {status} {self._MOTIVOS.get(status, '')}\r\n"
+                     "Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+        escritor.write(cabecalho.encode('latin-1') + corpo)
+
+    def _nome_aba(self, dados):
+        nome_aba = dados.get('aba')
+        if nome_aba not in self.buscador.nomes_abas:
+            raise ErroRequisicao(404, f"Setor não encontrado: {nome_aba}.")
+        return nome_aba
+
+    def _saude(self, dados):
+        return {'status': 'ok', 'setores': len(self.buscador.nomes_abas), 'requisicoes': self.requisicoes}
+
+    def _abas(self, dados):
+        return {'abas': list(self.buscador.nomes_abas),
+                'carregadas': [nome for nome in self.buscador.nomes_abas if nome in self.buscador.dados_abas]}
+
+    def _carregar_aba(self, dados):
+        """Prepara a aba (no modo sob demanda) antes da primeira busca."""
+        nome_aba = self._nome_aba(dados)
+        self.buscador.carregar_aba(nome_aba)
+        return {'aba': nome_aba, 'carregada': True}
+
+    def _buscar(self, dados):
+        """
+        Executa 'buscar_avancada' na aba informada, ou 'buscar_global' quando 'aba' é omitida, com o
+        orçamento de tempo da configuração (ou 'orcamento_segundos'). As colunas internas (prefixo
+        '_') não são enviadas, exceto '_ABA' e, com 'incluir_texto_busca', '_TEXTO_BUSCA'.
+        """
+        termo = str(dados.get('termo') or '').strip()
+        if not termo:
+            raise ErroRequisicao(400, "Informe o 'termo' da busca.")
+        filtros = dados.get('filtros') or None
+        if filtros is not None and not isinstance(filtros, dict):
+            raise ErroRequisicao(400, "'filtros' deve ser um objeto {coluna: valor}.")
+        try:
+            max_resultados = int(dados.get('max_resultados') or 0) or None
+            orcamento = float(dados.get('orcamento_segundos', self.buscador.config.get('orcamento_busca_segundos', 0)))
+        except (TypeError, ValueError):
+            raise ErroRequisicao(400, "'max_resultados' e 'orcamento_segundos' devem ser números.")
+
+        cancelamento = CancelamentoBusca(orcamento)
+        inicio = time.perf_counter()
+        if dados.get('aba'):
+            nome_aba = self._nome_aba(dados)
+            resultados = self.buscador.buscar_avancada(nome_aba, termo, filtros, max_resultados,
+                                                       incremental=bool(dados.get('incremental')),
+                                                       cancelamento=cancelamento)
+        else:
+            nome_aba = None
+            resultados = self.buscador.buscar_global(termo, filtros, max_resultados, cancelamento=cancelamento)
+        tempo_busca = time.perf_counter() - inicio
+
+        colunas = [col for col in resultados.columns if col == '_ABA' or not str(col).startswith('_')]
+        if dados.get('incluir_texto_busca') and '_TEXTO_BUSCA' in resultados.columns:
+            colunas.append('_TEXTO_BUSCA')
+        return {'aba': nome_aba, 'termo': termo, 'total': len(resultados),
+                'parcial': bool(resultados.attrs.get('parcial')), 'etapas': list(resultados.attrs.get('etapas', ())),
+                'tempo_ms': round(tempo_busca * 1000, 3),
+                'resultados': resultados[colunas].astype(str).to_dict(orient='records')}
+
+    def _estatisticas(self, dados):
+        buscador = self.buscador
+        cache = buscador.cache_busca
+        return {
+            'estatisticas': buscador.copiar_estatisticas(),
+            'cache': {'ativo': bool(buscador.config['habilitar_cache']), 'entradas': len(cache),
+                      'bytes': int(cache.bytes_usados), 'acertos': cache.acertos, 'falhas': cache.falhas,
+                      'remocoes': cache.remocoes, 'expiracoes': cache.expiracoes},
+            'memoria_abas': {nome: {'coluna': int(coluna), 'armazenado': int(armazenado)}
+                             for nome, (coluna, armazenado) in dict(buscador.memoria_abas).items()},
+            'latencias': buscador.metricas.resumos(),
+            'requisicoes': self.requisicoes,
+        }
+
+    def _limpar_cache(self, dados):
+        self.buscador.cache_busca.limpar()
+        return {'cache_limpo': True}
+
+    def _recarregar(self, dados):
+        """Recarrega os setores alterados na planilha (None em 'alteradas' se ela não pôde ser lida)."""
+        return {'alteradas': self.buscador.recarregar_alteracoes()}
+
+    def _listar_fraseologias(self, dados):
+        """Lista os códigos de cada tipo de fraseologia e os campos que cada um pede."""
+        return {
+            'positiva': {'campos': CAMPOS_POSITIVA},
+            'negativa': {codigo: {'nome': info['nome'],
+                                  'campos': campos_fraseologia(MODELOS_NEGATIVA[codigo], CAMPOS_NEGATIVA)}
+                         for codigo, info in DADOS_RESTRICOES.items()},
+            'finalizacao': {codigo: {'nome': info['nome'],
+                                     'campos': campos_fraseologia(MODELOS_FINALIZACAO[codigo], CAMPOS_FINALIZACAO)}
+                            for codigo, info in FERRAMENTAS_FINALIZACAO.items()},
+            'reembolso': {'campos': []},
+        }
+
+    def _gerar_fraseologia(self, dados):
+        """
+        Gera uma fraseologia: 'tipo' positiva (com 'itens'), negativa ou finalizacao (com 'codigo'
+        e 'campos') ou reembolso. Campos ausentes ou códigos inválidos respondem com status 400.
+        """
+        tipo = dados.get('tipo')
+        itens = dados.get('itens') or []
+        campos = dados.get('campos') or {}
+        if not isinstance(campos, dict) or not isinstance(itens, list) or not all(isinstance(i, dict) for i in itens):
+            raise ErroRequisicao(400, "'campos' deve ser um objeto e 'itens' uma lista de objetos.")
+        try:
+            if tipo == 'positiva':
+                texto = montar_fraseologia_positiva(itens)
+            elif tipo == 'negativa':
+                texto = montar_fraseologia_negativa(str(dados.get('codigo', '')), campos)
+            elif tipo == 'finalizacao':
+                texto = montar_fraseologia_finalizacao(str(dados.get('codigo', '')), campos)
+            elif tipo == 'reembolso':
+                texto = MODELOS_TEXTO['REEMBOLSO'].renderizar({})
+            else:
+                raise ErroRequisicao(
+                    400, "Tipo de fraseologia inválido: use 'positiva', 'negativa', 'finalizacao' ou 'reembolso'.")
+        except ValueError as e:
+            raise ErroRequisicao(400, str(e))
+        return {'tipo': tipo, 'texto': texto}
+
+
+class ClienteBusca:
+    """
+    Cliente do servidor local para o terminal (python mkacete.py --cliente): oferece as operações do
+    MecanismoBuscaAvancado usadas pelos menus, mas as buscas, o cache e as estatísticas ficam no
+    servidor, sem ler a planilha neste processo. A exibição dos resultados é a mesma do modo local.
+    """
+
+    # Exibição e agrupamento por tema reaproveitados do mecanismo local.
+    _TEMAS_RESULTADOS = MecanismoBuscaAvancado._TEMAS_RESULTADOS
+    exibir_resultados_avancados = MecanismoBuscaAvancado.exibir_resultados_avancados
+    _agrupar_resultados_por_tema = MecanismoBuscaAvancado._agrupar_resultados_por_tema
+    salvar_configuracao = MecanismoBuscaAvancado.salvar_configuracao
+
+    def __init__(self, url='', porta=None, tempo_limite=60):
+        self.config = MecanismoBuscaAvancado._carregar_configuracao(self)
+        self.url = (url or f"http://{ServidorBusca.HOST}:{porta or self.config['porta_servidor']}").rstrip('/')
+        self.tempo_limite = tempo_limite  # Tempo máximo de espera por uma resposta do servidor.
+        self.metricas = MetricasDesempenho()  # Apenas a exibição é medida no cliente.
+        self.renderizador = RenderizadorResultados(self.config.get('resultados_por_pagina', 0))
+        # O orçamento de tempo é aplicado pelo servidor; aqui a busca apenas deixa de ser aguardada.
+        self.executor_buscas = ExecutorBuscas()
+        self.nomes_abas = []
+        try:
+            self.nomes_abas = self._requisitar('GET', '/abas')['abas']
+            print(f"{Colors.BATMAN_YELLOW}✓ Conectado ao servidor {Colors.BOLD}{self.url}{Colors.ENDC}")
+            print(f"{Colors.GOTHAM_TEXT}Total de abas disponíveis: {len(self.nomes_abas)}{Colors.ENDC}")
+        except ErroRequisicao as e:
+            print(f"{Colors.BATMAN_YELLOW}Falha ao conectar ao servidor: {e}{Colors.ENDC}")
+
+    def _requisitar(self, metodo, caminho, dados=None):
+        """Envia uma requisição JSON ao servidor e retorna a resposta. Levanta ErroRequisicao em caso de falha."""
+        corpo = None if dados is None else json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        requisicao = urllib.request.Request(self.url + caminho, data=corpo, method=metodo,
+                                            headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.tempo_limite) as resposta:
+                return json.loads(resposta.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                mensagem = json.loads(e.read().decode('utf-8')).get('erro', e.reason)
+            except ValueError:
+                mensagem = e.reason
+            raise ErroRequisicao(e.code, mensagem)
+        except (urllib.error.URLError, OSError) as e:
+            raise ErroRequisicao(503, f"servidor indisponível em {self.url} ({e})")
+
+    def carregar_aba(self, nome_aba):
+        """Pede ao servidor que prepare a aba (modo sob demanda) antes da primeira busca."""
+        return self._requisitar('POST', '/abas/carregar', {'aba': nome_aba})
+
+    def buscar_incremental(self, nome_aba, termo, filtros=None, max_resultados=None, cancelamento=None):
+        return self._buscar(nome_aba, termo, filtros, max_resultados, True, cancelamento)
+
+    def buscar_global(self, termo, filtros=None, max_resultados=None, cancelamento=None):
+        return self._buscar(None, termo, filtros, max_resultados, False, cancelamento)
+
+    def _buscar(self, nome_aba, termo, filtros, max_resultados, incremental, cancelamento):
+        """Executa a busca no servidor e monta o DataFrame dos resultados (com '_TEXTO_BUSCA' para os temas)."""
+        if cancelamento is not None:
+            cancelamento.continuar()  # Uma busca cancelada antes de começar nem chega ao servidor.
+        try:
+            resposta = self._requisitar('POST', '/buscar', {
+                'aba': nome_aba, 'termo': termo, 'filtros': filtros, 'max_resultados': max_resultados,
+                'incremental': incremental, 'incluir_texto_busca': True,
+                'orcamento_segundos': self.config.get('orcamento_busca_segundos', 0)})
+        except ErroRequisicao as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Busca no servidor falhou: {e}{Colors.ENDC}")
+            return pd.DataFrame()
+        resultados = pd.DataFrame(resposta['resultados'])
+        resultados.attrs['parcial'] = resposta['parcial']
+        resultados.attrs['etapas'] = tuple(resposta['etapas'])
+        return resultados
+
+    def mostrar_estatisticas(self):
+        """Exibe o relatório de status do servidor (buscas de todos os terminais conectados)."""
+        try:
+            dados = self._requisitar('GET', '/estatisticas')
+        except ErroRequisicao as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível obter as estatísticas: {e}{Colors.ENDC}")
+            return
+        estatisticas, cache = dados['estatisticas'], dados['cache']
+        print(f"\n{Colors.BATMAN_YELLOW}>>> Relatório de Status do Servidor <<<{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Servidor: {Colors.BOLD}{self.url} ({dados['requisicoes']} requisições){Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Total de consultas: {Colors.BOLD}{estatisticas['total_buscas']}{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Tempo médio de resposta: {Colors.BOLD}{estatisticas['tempo_medio_busca']:.3f}s{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Total de resultados gerados: {Colors.BOLD}{estatisticas['resultados_encontrados']}{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Buscas incrementais refinadas: {Colors.BOLD}{estatisticas['buscas_refinadas']}{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Buscas globais: {Colors.BOLD}{estatisticas['buscas_globais']}{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Cache de memória: {Colors.BOLD}{cache['entradas']}{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Memória do cache: {Colors.BOLD}{cache['bytes'] / (1024 * 1024):.2f} MB{Colors.ENDC}")
+        print(
+            f"{Colors.GOTHAM_TEXT}Cache (acertos/falhas/remoções/expirados): {Colors.BOLD}{cache['acertos']}/"
+            f"{cache['falhas']}/{cache['remocoes']}/{cache['expiracoes']}{Colors.ENDC}")
+        gerais = [resumo for resumo in dados['latencias'] if resumo['aba'] is None]
+        if gerais:
+            print(f"{Colors.GOTHAM_TEXT}Latência por etapa (medições, média e p50/p95/p99 em ms):{Colors.ENDC}")
+            for resumo in gerais:
+                print(f"  {Colors.GOTHAM_TEXT}{MetricasDesempenho.ETAPAS.get(resumo['etapa'], resumo['etapa'])}: "
+                      f"{Colors.BOLD}{resumo['total']}× {resumo['media_ms']:.2f} "
+                      f"({resumo['p50_ms']:.2f}/{resumo['p95_ms']:.2f}/{resumo['p99_ms']:.2f}){Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Status do cache: {Colors.BOLD}{'Ativo' if cache['ativo'] else 'Inativo'}{Colors.ENDC}")
+        print(f"{Colors.BATMAN_YELLOW}-----------------------------------------{Colors.ENDC}")
+
+    def limpar_cache(self):
+        """Limpa o cache de busca do servidor (compartilhado por todos os terminais)."""
+        try:
+            self._requisitar('POST', '/cache/limpar')
+            print(f"{Colors.BATMAN_YELLOW}✓ Cache de busca limpo com sucesso! {Colors.ENDC}")
+        except ErroRequisicao as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível limpar o cache: {e}{Colors.ENDC}")
+
+    def recarregar_alteracoes(self):
+        """Pede ao servidor que recarregue os setores alterados na planilha e retorna os nomes deles."""
+        try:
+            return self._requisitar('POST', '/recarregar')['alteradas']
+        except ErroRequisicao as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível recarregar a matriz de dados: {e}{Colors.ENDC}")
+            return None
+
+    def exportar_metricas(self, caminho='metricas_desempenho.jsonl'):
+        """Exporta os resumos de latência do servidor em JSON Lines, no mesmo formato do modo local."""
+        try:
+            resumos = self._requisitar('GET', '/estatisticas')['latencias']
+            with open(caminho, 'w', encoding='utf-8') as f:
+                for resumo in resumos:
+                    f.write(json.dumps(resumo, ensure_ascii=False) + '\n')
+            print(f"{Colors.BATMAN_YELLOW}✓ {len(resumos)} resumo(s) de métricas exportado(s) para '{caminho}'!{Colors.ENDC}")
+        except (ErroRequisicao, OSError) as e:
+            print(f"{Colors.BATMAN_YELLOW}Aviso: Não foi possível exportar as métricas: {e}{Colors.ENDC}")
+
+
+def executar_servidor(nome_arquivo, porta=None):
+    """Carrega a matriz de dados uma única vez e atende os terminais pelo servidor local."""
+    buscador = MecanismoBuscaAvancado(nome_arquivo)
+    if not buscador.nomes_abas:
+        print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Falha ao carregar os setores de dados.{Colors.ENDC}")
+        return
+    servidor = ServidorBusca(buscador, porta if porta is not None else buscador.config.get('porta_servidor', 8765),
+                             buscador.config.get('trabalhadores_servidor', 4))
+    servidor.executar()
+
+
+# =================================================================================
+# BLOCO 8: PROCESSAMENTO EM LOTE
+# =================================================================================
+# Modo não interativo (python mkacete.py --lote termos.csv --saida resultados.xlsx): executa uma
+# lista de consultas lida de um arquivo e grava os resultados à medida que ficam prontos.
+
+class EscritorResultados:
+    """
+    Grava os resultados do lote em CSV (separado por ';', para abrir direto no Excel), JSON Lines ou
+    XLSX, linha a linha, sem acumular os resultados em memória. O XLSX usa o modo 'write_only' do
+    openpyxl, que também grava as linhas em fluxo.
+    """
+
+    FORMATOS = ('.csv', '.jsonl', '.xlsx')
+
+    def __init__(self, caminho, colunas):
+        self.caminho = caminho
+        self.formato = os.path.splitext(caminho)[1].lower()
+        self.colunas = colunas  # Colunas do CSV e do XLSX (no JSON Lines, cada linha leva só as suas).
+        self.linhas = 0  # Linhas de resultado gravadas.
+        if self.formato not in self.FORMATOS:
+            raise ValueError(f"Formato de saída não suportado: '{self.formato}' (use {', '.join(self.FORMATOS)}).")
+        if self.formato == '.xlsx':
+            self._livro = Workbook(write_only=True)
+            self._planilha = self._livro.create_sheet('RESULTADOS')
+            self._planilha.append(colunas)
+        else:
+            # 'utf-8-sig' faz o Excel reconhecer a acentuação do CSV.
+            self._arquivo = open(caminho, 'w', encoding='utf-8-sig' if self.formato == '.csv' else 'utf-8',
+                                 newline='')
+            if self.formato == '.csv':
+                self._csv = csv.writer(self._arquivo, delimiter=';')
+                self._csv.writerow(colunas)
+
+    def escrever(self, registro):
+        """Grava uma linha de resultado (dicionário coluna -> valor)."""
+        if self.formato == '.jsonl':
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        elif self.formato == '.csv':
+            self._csv.writerow([registro.get(coluna, '') for coluna in self.colunas])
+        else:
+            self._planilha.append([registro.get(coluna, '') for coluna in self.colunas])
+        self.linhas += 1
+
+    def fechar(self):
+        if self.formato == '.xlsx':
+            self._livro.save(self.caminho)
+        else:
+            self._arquivo.close()
+
+
+class ProcessadorLote:
+    """
+    Executa uma lista de consultas (TXT ou CSV) no mecanismo de busca, sem interação. Consultas
+    repetidas (mesma chave canônica do cache: termo normalizado, aba e filtros) são executadas uma
+    única vez; as demais rodam em um pool de processos (cada um com o próprio mecanismo, carregado
+    do snapshot em modo somente leitura e com a configuração do mecanismo principal) ou de threads,
+    e os resultados são gravados na ordem do arquivo, com no máximo algumas consultas por
+    trabalhador em memória ao mesmo tempo.
+    """
+
+    # Colunas que identificam a consulta de cada linha de resultado, antes das colunas das abas.
+    COLUNAS_CONSULTA = ['LINHA', 'TERMO', 'SETOR', 'RESULTADOS', 'POSICAO']
+    CONSULTAS_POR_TRABALHADOR = 4  # Consultas em andamento (ou aguardando gravação) por trabalhador.
+    INTERVALO_PROGRESSO = 100  # Consultas entre duas atualizações do progresso no terminal.
+    # Os processos não guardam resultados (as consultas não se repetem) e buscam as abas em threads.
+    CONFIG_PROCESSOS = {'habilitar_cache': False, 'busca_global_processos': False}
+
+    def __init__(self, buscador, nome_aba=None, max_resultados=None, trabalhadores=4, processos=True):
+        self.buscador = buscador
+        self.nome_aba = nome_aba  # Aba padrão das consultas ('' ou None = busca global).
+        self.max_resultados = max_resultados
+        self.trabalhadores = max(1, trabalhadores)
+        self.processos = processos
+        self.estatisticas = {'lidas': 0, 'executadas': 0, 'repetidas': 0, 'invalidas': 0, 'com_erro': 0,
+                             'sem_resultados': 0}
+
+    def ler_consultas(self, caminho):
+        """
+        Gera as consultas do arquivo como (linha, termo, aba, filtros). Em TXT, cada linha não vazia
+        é um termo. Em CSV (',', ';' ou tabulação), o termo vem da coluna 'termo' (ou da primeira),
+        a aba da coluna opcional 'aba' (ou 'setor') e as demais colunas preenchidas viram filtros.
+        """
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            if os.path.splitext(caminho)[1].lower() != '.csv':
+                for numero, linha in enumerate(f, 1):
+                    if linha.strip():
+                        yield numero, linha.strip(), self.nome_aba, {}
+                return
+            amostra = f.read(8192)
+            f.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+            except csv.Error:
+                dialeto = csv.excel
+            leitor = csv.DictReader(f, dialect=dialeto)
+            campos = leitor.fieldnames or []
+            coluna_termo = next((c for c in campos if c.strip().lower() == 'termo'), campos[0] if campos else None)
+            coluna_aba = next((c for c in campos if c.strip().lower() in ('aba', 'setor')), None)
+            for registro in leitor:
+                termo = (registro.get(coluna_termo) or '').strip()
+                if not termo:
+                    continue
+                nome_aba = (registro.get(coluna_aba) or '').strip() if coluna_aba else ''
+                # Colunas extras sem cabeçalho (chave None) são ignoradas.
+                filtros = {coluna.strip(): valor.strip() for coluna, valor in registro.items()
+                           if coluna and coluna not in (coluna_termo, coluna_aba) and isinstance(valor, str)
+                           and valor.strip()}
+                yield leitor.line_num, termo, nome_aba or self.nome_aba, filtros
+
+    def resolver_aba(self, nome_aba):
+        """Retorna o nome da aba como está na planilha, sem diferenciar maiúsculas (None se não existir)."""
+        abas = {nome.strip().upper(): nome for nome in self.buscador.nomes_abas}
+        return abas.get(nome_aba.strip().upper())
+
+    def colunas_saida(self):
+        """Colunas do CSV/XLSX: as da consulta e as colunas visíveis da aba escolhida (ou de todas)."""
+        colunas = list(self.COLUNAS_CONSULTA)
+        for nome_aba in ([self.nome_aba] if self.nome_aba else self.buscador.nomes_abas):
+            df = self.buscador.carregar_aba(nome_aba)
+            if df is None:
+                continue
+            for coluna in df.columns:
+                if not str(coluna).startswith('_') and coluna not in colunas:
+                    colunas.append(coluna)
+        return colunas
+
+    @classmethod
+    def executar_consulta(cls, buscador, termo, nome_aba, filtros, max_resultados):
+        """
+        Executa uma consulta (na aba informada ou em todas) e retorna (registros, tempo em segundos),
+        com um registro (coluna -> valor) por resultado, ou um único registro sem dados se não houver resultados.
+        """
+        inicio = time.perf_counter()
+        if nome_aba:
+            resultados = buscador.buscar_avancada(nome_aba, termo, filtros or None, max_resultados)
+        else:
+            resultados = buscador.buscar_global(termo, filtros or None, max_resultados)
+        consulta = {'LINHA': None, 'TERMO': termo, 'SETOR': nome_aba or '', 'RESULTADOS': len(resultados)}
+        if resultados.empty:
+            return [dict(consulta, POSICAO=0)], time.perf_counter() - inicio
+        setores = resultados['_ABA'].tolist() if '_ABA' in resultados.columns else [nome_aba] * len(resultados)
+        visiveis = resultados[[col for col in resultados.columns if not str(col).startswith('_')]]
+        registros = []
+        for posicao, (setor, linha) in enumerate(zip(setores, visiveis.astype(str).to_dict(orient='records')), 1):
+            registro = dict(consulta, SETOR=setor, POSICAO=posicao)
+            # Campos vazios ficam de fora (na busca global, cada linha só preenche as colunas da sua aba).
+            registro.update((chave, valor) for chave, valor in linha.items()
+                            if valor.strip() and chave not in cls.COLUNAS_CONSULTA)
+            registros.append(registro)
+        return registros, time.perf_counter() - inicio
+
+    def _criar_pool(self):
+        """
+        Cria o pool de trabalhadores e a função de consulta correspondente: processos (a busca usa
+        CPU e, em threads, disputa o GIL) ou threads, se os processos não puderem ser criados.
+        """
+        if self.processos:
+            try:
+                pool = ProcessPoolExecutor(max_workers=self.trabalhadores, initializer=_iniciar_processo_busca,
+                                           initargs=(self.buscador.nome_arquivo_excel,
+                                                     dict(self.buscador.config, **self.CONFIG_PROCESSOS)))
+                return pool, _consultar_lote_em_processo
+            except Exception as e:
+                print(f"{Colors.BATMAN_YELLOW}Aviso: Lote em processos indisponível ({e}). Usando threads.{Colors.ENDC}")
+        pool = ThreadPoolExecutor(max_workers=self.trabalhadores, thread_name_prefix='lote')
+        return pool, functools.partial(self.executar_consulta, self.buscador)
+
+    def _gravar(self, escritor, numero, termo, futuro):
+        try:
+            registros, tempo_consulta = futuro.result()
+        except Exception as e:
+            self.estatisticas['com_erro'] += 1
+            print(f"\n{Colors.BATMAN_YELLOW}Aviso: Falha na consulta da linha {numero} ('{termo}'): {e}{Colors.ENDC}")
+            return
+        self.buscador.metricas.registrar('consulta_lote', tempo_consulta, registros[0]['SETOR'] or None)
+        if registros[0]['RESULTADOS'] == 0:
+            self.estatisticas['sem_resultados'] += 1
+        for registro in registros:
+            registro['LINHA'] = numero
+            escritor.escrever(registro)
+        self.estatisticas['executadas'] += 1
+        if self.estatisticas['executadas'] % self.INTERVALO_PROGRESSO == 0:
+            sys.stdout.write(f"\r{Colors.GOTHAM_TEXT}  {self.estatisticas['executadas']} consultas processadas...{Colors.ENDC}")
+            sys.stdout.flush()
+
+    def executar(self, entrada, saida):
+        """Processa as consultas de 'entrada', grava os resultados em 'saida' e exibe a vazão ao final."""
+        inicio = time.perf_counter()
+        escritor = EscritorResultados(saida, self.colunas_saida())
+        vistas = set()
+        pendentes = deque()  # (linha, termo, futuro), na ordem do arquivo.
+        janela = self.trabalhadores * self.CONSULTAS_POR_TRABALHADOR
+        pool, consultar = self._criar_pool()
+        try:
+            with pool:
+                for numero, termo, nome_aba, filtros in self.ler_consultas(entrada):
+                    self.estatisticas['lidas'] += 1
+                    if nome_aba:
+                        nome_informado, nome_aba = nome_aba, self.resolver_aba(nome_aba)
+                        if nome_aba is None:
+                            self.estatisticas['invalidas'] += 1
+                            print(f"\n{Colors.BATMAN_YELLOW}Aviso: Linha {numero}: setor '{nome_informado}' "
+                                  f"não encontrado.{Colors.ENDC}")
+                            continue
+                    # Consultas equivalentes às já enviadas (mesma chave do cache) não são repetidas.
+                    chave = self.buscador._chave_cache(nome_aba or None, termo, filtros)
+                    if chave in vistas:
+                        self.estatisticas['repetidas'] += 1
+                        continue
+                    vistas.add(chave)
+                    pendentes.append((numero, termo, pool.submit(consultar, termo, nome_aba, filtros,
+                                                                 self.max_resultados)))
+                    # Grava na ordem do arquivo e limita as consultas em memória ao tamanho da janela.
+                    while len(pendentes) >= janela or (pendentes and pendentes[0][2].done()):
+                        self._gravar(escritor, *pendentes.popleft())
+                while pendentes:
+                    self._gravar(escritor, *pendentes.popleft())
+        finally:
+            escritor.fechar()
+        tempo_total = time.perf_counter() - inicio
+        self._mostrar_vazao(escritor, tempo_total)
+        return dict(self.estatisticas, linhas_gravadas=escritor.linhas, tempo_segundos=tempo_total)
+
+    def _mostrar_vazao(self, escritor, tempo_total):
+        estatisticas = self.estatisticas
+        vazao = estatisticas['executadas'] / tempo_total if tempo_total else 0.0
+        print(f"\n{Colors.BATMAN_YELLOW}✓ Lote concluído em {tempo_total:.2f}s: {Colors.BOLD}{escritor.linhas}{Colors.ENDC}"
+              f"{Colors.BATMAN_YELLOW} linha(s) gravada(s) em '{escritor.caminho}'.{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Consultas lidas/executadas/repetidas: {Colors.BOLD}{estatisticas['lidas']}/"
+              f"{estatisticas['executadas']}/{estatisticas['repetidas']}{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Sem resultados/com erro/setor inválido: {Colors.BOLD}{estatisticas['sem_resultados']}/"
+              f"{estatisticas['com_erro']}/{estatisticas['invalidas']}{Colors.ENDC}")
+        print(f"{Colors.GOTHAM_TEXT}Vazão: {Colors.BOLD}{vazao:.1f} consultas/s "
+              f"({escritor.linhas / tempo_total if tempo_total else 0.0:.1f} linhas/s, "
+              f"{self.trabalhadores} trabalhadores){Colors.ENDC}")
+        resumo = self.buscador.metricas.resumo('consulta_lote')
+        if resumo is not None:
+            print(f"{Colors.GOTHAM_TEXT}Latência por consulta (média e p50/p95/p99 em ms): {Colors.BOLD}"
+                  f"{resumo['media_ms']:.2f} ({resumo['p50_ms']:.2f}/{resumo['p95_ms']:.2f}/{resumo['p99_ms']:.2f})"
+                  f"{Colors.ENDC}")
+
+
+def executar_lote(nome_arquivo, argumentos):
+    """Carrega a matriz de dados e processa o arquivo de consultas do modo em lote."""
+    if not os.path.exists(argumentos.lote):
+        print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Arquivo de consultas '{argumentos.lote}' não encontrado.{Colors.ENDC}")
+        return
+    saida = argumentos.saida or os.path.splitext(argumentos.lote)[0] + '_resultados.csv'
+    if os.path.splitext(saida)[1].lower() not in EscritorResultados.FORMATOS:
+        print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Use uma saída {', '.join(EscritorResultados.FORMATOS)}.{Colors.ENDC}")
+        return
+    # Sem cache (as consultas repetidas já são descartadas), sem recarga automática e sem orçamento de tempo.
+    buscador = MecanismoBuscaAvancado(nome_arquivo, {'habilitar_cache': False, 'intervalo_recarga_segundos': 0})
+    if not buscador.nomes_abas:
+        print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Falha ao carregar os setores de dados.{Colors.ENDC}")
+        return
+    processador = ProcessadorLote(buscador, None, argumentos.max_resultados,
+                                  argumentos.trabalhadores or buscador.config.get('trabalhadores_lote', 4),
+                                  buscador.config.get('lote_em_processos', True))
+    if argumentos.aba:
+        processador.nome_aba = processador.resolver_aba(argumentos.aba)
+        if processador.nome_aba is None:
+            print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Setor '{argumentos.aba}' não encontrado.{Colors.ENDC}")
+            return
+    try:
+        processador.executar(argumentos.lote, saida)
+    finally:
+        buscador._encerrar_pool_processos()
+
+
+# =================================================================================
+# BLOCO 9: PONTO DE ENTRADA DO PROGRAMA
 # =================================================================================
 # Este é o ponto de partida do script. A função 'main' é responsável por inicializar
 # o sistema, carregar os dados e exibir o menu principal, controlando todo o fluxo.
 
-def main():
+def interpretar_argumentos(argv=None):
+    """Interpreta os argumentos da linha de comando (modo terminal, servidor local, cliente ou lote)."""
+    parser = argparse.ArgumentParser(description='SUBMUNDO DAS TREVAS - busca avançada na matriz de dados.')
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--servidor', action='store_true',
+                      help='Carrega a matriz uma vez e atende os terminais por HTTP/JSON em 127.0.0.1.')
+    modo.add_argument('--cliente', nargs='?', const='', metavar='URL',
+                      help='Usa o servidor local em vez de carregar a planilha (padrão: http://127.0.0.1:<porta>).')
+    modo.add_argument('--lote', metavar='ENTRADA',
+                      help='Executa as consultas de um arquivo TXT (um termo por linha) ou CSV (termo, aba, filtros).')
+    parser.add_argument('--porta', type=int, help="Porta do servidor local (padrão: 'porta_servidor' do config.json).")
+    parser.add_argument('--saida', metavar='SAIDA',
+                        help='Arquivo de resultados do lote: .csv, .jsonl ou .xlsx (padrão: <entrada>_resultados.csv).')
+    parser.add_argument('--aba', help='Setor pesquisado no lote (padrão: busca global, ou a coluna "aba" do CSV).')
+    parser.add_argument('--max-resultados', type=int, help='Máximo de resultados por consulta do lote.')
+    parser.add_argument('--trabalhadores', type=int,
+                        help="Consultas do lote executadas ao mesmo tempo (padrão: 'trabalhadores_lote').")
+    return parser.parse_args(argv)
+
+
+def localizar_planilha():
+    """Procura a matriz de dados 'BATMAN.xlsx' nos caminhos pré-definidos e retorna o caminho encontrado (ou None)."""
+    caminho_local = 'BATMAN.xlsx'
+    caminho_completo = r'C:\Users\marcos.oliveira7\Documents\TREVAS\SUBMUNDO DAS TREVAS-main\BATMAN.xlsx'
+
+    if os.path.exists(caminho_local):
+        print(f"{Colors.BATMAN_YELLOW}✓ Conexão estabelecida com {Colors.BOLD}{caminho_local}{Colors.ENDC}")
+        return caminho_local
+    if os.path.exists(caminho_completo):
+        print(f"{Colors.BATMAN_YELLOW}✓ Conexão estabelecida com {Colors.BOLD}{caminho_completo}{Colors.ENDC}")
+        return caminho_completo
+    # Erro se o arquivo não for encontrado em nenhum dos caminhos.
+    print(f"{Colors.BATMAN_YELLOW}✗ ERRO FATAL: Matriz de dados 'BATMAN.xlsx' não encontrada.{Colors.ENDC}")
+    print(f"  Verifique os caminhos: {caminho_local} ou {caminho_completo}")
+    return None
+
+
+def main(argv=None):
     """Função principal que inicializa e executa o sistema."""
+    argumentos = interpretar_argumentos(argv)
     warnings.filterwarnings('ignore')  # Ignora avisos de bibliotecas.
     colorama.init()  # Inicializa o colorama para suporte de cores no terminal.
 
+    if argumentos.servidor:
+        # Modo servidor: sem menus, apenas carrega os dados e atende as requisições.
+        nome_arquivo = localizar_planilha()
+        if nome_arquivo:
+            executar_servidor(nome_arquivo, argumentos.porta)
+        return
+    if argumentos.lote:
+        # Modo em lote: executa as consultas do arquivo e grava os resultados, sem menus.
+        nome_arquivo = localizar_planilha()
+        if nome_arquivo:
+            executar_lote(nome_arquivo, argumentos)
+        return
+
     try:
         terminal_width = os.get_terminal_size().columns
     except OSError:
@@ -1069,29 +3661,21 @@ def main():
     sys.stdout.write(f"\r{Colors.BATMAN_YELLOW}Calibração concluída!{Colors.ENDC}\n")
     sys.stdout.flush()
 
-    # Tenta encontrar o arquivo da matriz de dados 'BATMAN.xlsx' em dois caminhos pré-definidos.
-    caminho_local = 'BATMAN.xlsx'
-    caminho_completo = r'C:\Users\marcos.oliveira7\Documents\TREVAS\SUBMUNDO DAS TREVAS-main\BATMAN.xlsx'
-
-    if os.path.exists(caminho_local):
-        nome_arquivo = caminho_local
-        print(f"{Colors.BATMAN_YELLOW}✓ Conexão estabelecida com {Colors.BOLD}{caminho_local}{Colors.ENDC}")
-    elif os.path.exists(caminho_completo):
-        nome_arquivo = caminho_completo
-        print(f"{Colors.BATMAN_YELLOW}✓ Conexão estabelecida com {Colors.BOLD}{caminho_completo}{Colors.ENDC}")
+    if argumentos.cliente is not None:
+        # Modo cliente: as buscas são feitas pelo servidor local, que já tem a matriz carregada.
+        buscador = ClienteBusca(argumentos.cliente, argumentos.porta)
     else:
-        # Erro se o arquivo não for encontrado em nenhum dos caminhos.
-        print(f"{Colors.BATMAN_YELLOW}✗ ERRO FATAL: Matriz de dados 'BATMAN.xlsx' não encontrada.{Colors.ENDC}")
-        print(f"  Verifique os caminhos: {caminho_local} ou {caminho_completo}")
-        return
-
-    # Inicializa o objeto principal de busca e carrega os dados.
-    buscador = MecanismoBuscaAvancado(nome_arquivo)
-    if not buscador.dados_abas:
+        # Tenta encontrar o arquivo da matriz de dados 'BATMAN.xlsx' em dois caminhos pré-definidos.
+        nome_arquivo = localizar_planilha()
+        if nome_arquivo is None:
+            return
+        # Inicializa o objeto principal de busca e carrega os dados.
+        buscador = MecanismoBuscaAvancado(nome_arquivo)
+    if not buscador.nomes_abas:
         print(f"{Colors.BATMAN_YELLOW}✗ ERRO: Falha ao carregar os setores de dados.{Colors.ENDC}")
         return
 
-    nomes_abas = list(buscador.dados_abas.keys())  # Obtém os nomes das abas para o menu.
+    nomes_abas = buscador.nomes_abas  # Obtém os nomes das abas para o menu.
 
     # Loop do Menu Principal.
     while True: